@@ -0,0 +1,69 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Loading of the compiled catalogs."""
+
+import os
+import atexit
+import shutil
+import tempfile
+
+from babel.messages.mofile import write_mo
+from babel.messages.catalog import Catalog
+
+from nagare import i18n
+
+
+def create_catalog(dirname, nb_messages):
+    catalog = Catalog(locale='fr')
+    for i in range(nb_messages):
+        catalog.add('Message number %d' % i, 'Message numéro %d' % i)
+
+    directory = os.path.join(dirname, 'fr', 'LC_MESSAGES')
+    os.makedirs(directory)
+
+    with open(os.path.join(directory, 'messages.mo'), 'wb') as f:
+        write_mo(f, catalog)
+
+    return dirname
+
+
+TEMP_DIR = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, TEMP_DIR, True)
+
+SMALL_CATALOG = create_catalog(os.path.join(TEMP_DIR, 'small'), 100)
+LARGE_CATALOG = create_catalog(os.path.join(TEMP_DIR, 'large'), 50000)
+
+
+def load(dirname, backend):
+    return lambda: i18n.TRANSLATIONS_BACKENDS[backend].load(dirname, 'fr', 'messages')
+
+
+def bench_load_small_catalog_babel():
+    return load(SMALL_CATALOG, 'babel')
+
+
+def bench_load_small_catalog_mmap():
+    return load(SMALL_CATALOG, 'mmap')
+
+
+def bench_load_large_catalog_babel():
+    return load(LARGE_CATALOG, 'babel')
+
+
+def bench_load_large_catalog_mmap():
+    return load(LARGE_CATALOG, 'mmap')
+
+
+def bench_get_translation_cache_hit():
+    i18n.set_translations_backend('babel')
+    locale = i18n.Locale('fr', dirname=SMALL_CATALOG)
+    locale._get_translation()
+
+    return locale._get_translation
@@ -0,0 +1,78 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Date and time formatting."""
+
+import datetime
+
+from babel import dates
+
+from nagare import i18n, local
+
+DT = datetime.datetime(2024, 7, 14, 9, 5, 3)
+
+
+def setup():
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR', timezone='Europe/Paris', default_timezone='UTC'))
+
+
+def bench_format_datetime():
+    setup()
+
+    return lambda: i18n.format_datetime(DT)
+
+
+def bench_format_datetime_babel():
+    """Former implementation, the named format resolved by babel on each call."""
+    setup()
+    locale = i18n.get_locale()
+
+    return lambda: dates.format_datetime(locale.to_timezone(DT), 'medium', locale=locale, tzinfo=locale.tzinfo)
+
+
+def bench_format_date():
+    setup()
+
+    return lambda: i18n.format_date(DT)
+
+
+def bench_format_date_babel():
+    """Former implementation, the named format resolved by babel on each call."""
+    setup()
+    locale = i18n.get_locale()
+
+    return lambda: dates.format_date(DT, 'medium', locale)
+
+
+DTS = [DT + datetime.timedelta(minutes=17 * i) for i in range(1000)]
+
+
+def bench_to_timezone_1000_datetimes():
+    setup()
+
+    return lambda: [i18n.to_timezone(dt) for dt in DTS]
+
+
+def bench_to_timezone_many_1000_datetimes():
+    setup()
+
+    return lambda: list(i18n.to_timezone_many(DTS))
+
+
+def bench_format_datetime_1000_datetimes():
+    setup()
+
+    return lambda: [i18n.format_datetime(dt) for dt in DTS]
+
+
+def bench_format_datetime_many_1000_datetimes():
+    setup()
+
+    return lambda: list(i18n.format_datetime_many(DTS))
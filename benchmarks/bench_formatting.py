@@ -0,0 +1,52 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Keyword substitution into the translated messages."""
+
+import re
+import functools
+
+from nagare import i18n, local
+
+MESSAGE = 'Hello %(name)s, you have %(count)s new messages in %(folder)s'
+KW = {'name': 'Alice', 'count': 3, 'folder': 'inbox'}
+
+
+@functools.lru_cache(1024)
+def compile_message(msg):
+    """Pre-parsed formatter: the named conversions replaced by positional ones."""
+    keys = tuple(re.findall(r'%\((\w+)\)s', msg))
+    return re.sub(r'%\((\w+)\)s', '%s', msg), keys
+
+
+def format_compiled(msg, kw):
+    template, keys = compile_message(msg)
+    return template % tuple([kw[key] for key in keys])
+
+
+def bench_modulo_operator():
+    return lambda: MESSAGE % KW
+
+
+def bench_skipped_modulo_operator():
+    """Substitution skipped for the translations without conversions."""
+    msg = 'Hello'
+    return lambda: msg % KW if KW and ('%' in msg) else msg
+
+
+def bench_precompiled_formatter():
+    """Alternative with a cache of pre-parsed formatters."""
+    return lambda: format_compiled(MESSAGE, KW)
+
+
+def bench_ugettext_with_keywords():
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return lambda: i18n.ugettext(MESSAGE, **KW)
@@ -0,0 +1,84 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Current locale retrieval."""
+
+from nagare import i18n, local
+
+
+def bench_get_locale_in_request():
+    i18n.set_locale_storage('local')
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return i18n.get_locale
+
+
+def bench_get_locale_in_request_eager_default():
+    """Former implementation, always building the default locale."""
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return lambda: getattr(local.request, 'nagare_locale', i18n.Locale())
+
+
+def bench_get_locale_outside_request():
+    i18n.set_locale_storage('local')
+    local.request = local.Process()
+
+    return i18n.get_locale
+
+
+def bench_get_locale_outside_request_eager_default():
+    """Former implementation, always building the default locale."""
+    local.request = local.Process()
+
+    return lambda: getattr(local.request, 'nagare_locale', i18n.Locale())
+
+
+def bench_locale_creation():
+    i18n.Locale('fr', 'FR').zone_formats  # Locale data loaded, as after the first request
+
+    return lambda: i18n.Locale('fr', 'FR')
+
+
+def bench_locale_creation_with_timezones():
+    i18n.Locale('fr', 'FR').zone_formats
+
+    return lambda: i18n.Locale('fr', 'FR', timezone='Europe/Paris', default_timezone='UTC')
+
+
+def bench_get_locale_in_context():
+    i18n.set_locale_storage('contextvars')
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return i18n.get_locale
+
+
+def _nested_locale(locale):
+    def nested_locale():
+        with locale:
+            i18n.get_locale()
+
+    return nested_locale
+
+
+def bench_nested_locale_in_request():
+    i18n.set_locale_storage('local')
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return _nested_locale(i18n.Locale('de', 'DE'))
+
+
+def bench_nested_locale_in_context():
+    i18n.set_locale_storage('contextvars')
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+    return _nested_locale(i18n.Locale('de', 'DE'))
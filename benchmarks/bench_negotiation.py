@@ -0,0 +1,66 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Negotiation of the locale from the ``Accept-Language`` header."""
+
+from nagare import i18n
+
+LOCALES = [('fr', 'FR'), ('de', 'DE'), ('en', 'GB'), ('en', 'US'), ('es', 'ES'), ('it', 'IT')]
+HEADERS = [
+    'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
+    'en-US,en;q=0.9',
+    'de-CH,de;q=0.9,fr;q=0.8,en;q=0.7,*;q=0.5',
+    'pt-BR,pt;q=0.9,es;q=0.8,en-US;q=0.7,en;q=0.6',
+    'ja,en-US;q=0.9,en;q=0.8',
+]
+
+
+class AcceptLanguage:
+    def __init__(self, header):
+        self.parsed = []
+        for i, language in enumerate(header.split(',')):
+            language, _, quality = language.strip().partition(';q=')
+            self.parsed.append((language, float(quality or 1) - i / 1000))
+
+
+class Request:
+    def __init__(self, header):
+        self.headers = {'Accept-Language': header}
+        self.accept_language = AcceptLanguage(header)
+
+
+REQUESTS = [Request(header) for header in HEADERS]
+
+
+def bench_negotiated_locale_5_headers():
+    return lambda: [i18n.NegotiatedLocale(request, LOCALES, ('en', 'US')) for request in REQUESTS]
+
+
+def bench_negotiated_locale_5_headers_cached():
+    cache = i18n.LRUCache(1024)
+
+    return lambda: [
+        i18n.NegotiatedLocale(request, LOCALES, ('en', 'US'), negotiation_cache=cache) for request in REQUESTS
+    ]
+
+
+def bench_negotiate_5_headers():
+    return lambda: [i18n.NegotiatedLocale.negotiate(request, LOCALES, ('en', 'US')) for request in REQUESTS]
+
+
+def bench_negotiate_5_headers_table():
+    table = i18n.NegotiationTable(LOCALES, ('en', 'US'))
+
+    return lambda: [
+        i18n.NegotiatedLocale.negotiate(request, LOCALES, ('en', 'US'), negotiation_table=table) for request in REQUESTS
+    ]
+
+
+def bench_negotiation_table_creation():
+    return lambda: i18n.NegotiationTable(LOCALES, ('en', 'US'))
@@ -0,0 +1,55 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Formatting of many numbers."""
+
+from nagare import i18n, local
+
+VALUES = [i * 1.37 for i in range(1000)]
+
+
+def setup():
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR'))
+
+
+def bench_format_decimal():
+    setup()
+
+    return lambda: i18n.format_decimal(1099.98)
+
+
+def bench_format_currency():
+    setup()
+
+    return lambda: i18n.format_currency(1099.98, 'EUR')
+
+
+def bench_format_decimal_1000_values():
+    setup()
+
+    return lambda: [i18n.format_decimal(value, '#,##0.00') for value in VALUES]
+
+
+def bench_format_decimal_many_1000_values():
+    setup()
+
+    return lambda: list(i18n.format_decimal_many(VALUES, '#,##0.00'))
+
+
+def bench_format_currency_1000_values():
+    setup()
+
+    return lambda: [i18n.format_currency(value, 'EUR') for value in VALUES]
+
+
+def bench_format_currency_many_1000_values():
+    setup()
+
+    return lambda: list(i18n.format_currency_many(VALUES, 'EUR'))
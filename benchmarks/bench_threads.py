@@ -0,0 +1,77 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Throughput of the shared locales across threads.
+
+Each benchmark does the same total number of operations, split between 1 to
+16 threads: the durations decrease with the number of threads only if the
+operations run in parallel, i.e. on a free-threaded Python.
+"""
+
+import os
+import datetime
+import concurrent.futures
+
+from nagare import i18n
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'locale')
+THREADS = (1, 2, 4, 8, 16)
+OPERATIONS = 1600
+
+_executors = {}
+
+
+def run_in_threads(f, threads):
+    executor = _executors.get(threads)
+    if executor is None:
+        executor = _executors[threads] = concurrent.futures.ThreadPoolExecutor(threads)
+
+    def job():
+        for _ in range(OPERATIONS // threads):
+            f()
+
+    def run():
+        for future in [executor.submit(job) for _ in range(threads)]:
+            future.result()
+
+    return run
+
+
+def gettext_benchmark(threads):
+    def bench():
+        locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+
+        return run_in_threads(lambda: locale.gettext('hello'), threads)
+
+    return bench
+
+
+def format_datetime_benchmark(threads):
+    def bench():
+        locale = i18n.get_shared_locale('fr', 'FR', timezone='Europe/Paris', default_timezone='UTC')
+        dt = datetime.datetime(2007, 4, 1, 15, 30)
+
+        return run_in_threads(lambda: locale.format_datetime(dt), threads)
+
+    return bench
+
+
+def load_translation_benchmark(threads):
+    def bench():
+        i18n.load_translation(LOCALE_DIR, 'fr_FR')
+
+        return run_in_threads(lambda: i18n.load_translation(LOCALE_DIR, 'fr_FR'), threads)
+
+    return bench
+
+
+for threads in THREADS:
+    globals()['bench_gettext_%d_threads' % threads] = gettext_benchmark(threads)
+    globals()['bench_format_datetime_%d_threads' % threads] = format_datetime_benchmark(threads)
+    globals()['bench_load_translation_%d_threads' % threads] = load_translation_benchmark(threads)
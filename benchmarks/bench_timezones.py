@@ -0,0 +1,54 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Timezone backends."""
+
+import datetime
+
+from nagare import i18n
+
+DT = datetime.datetime(2024, 7, 14, 9, 5, 3)
+
+
+def create_locale(backend):
+    return i18n.Locale(
+        'fr', 'FR', timezone='Europe/Paris', default_timezone='America/New_York', timezone_backend=backend
+    )
+
+
+def bench_locale_creation_pytz():
+    return lambda: create_locale('pytz')
+
+
+def bench_locale_creation_zoneinfo():
+    return lambda: create_locale('zoneinfo')
+
+
+def bench_to_timezone_pytz():
+    locale = create_locale('pytz')
+
+    return lambda: locale.to_timezone(DT)
+
+
+def bench_to_timezone_zoneinfo():
+    locale = create_locale('zoneinfo')
+
+    return lambda: locale.to_timezone(DT)
+
+
+def bench_to_utc_pytz():
+    locale = create_locale('pytz')
+
+    return lambda: locale.to_utc(DT)
+
+
+def bench_to_utc_zoneinfo():
+    locale = create_locale('zoneinfo')
+
+    return lambda: locale.to_utc(DT)
@@ -0,0 +1,71 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Translation of many messages."""
+
+import os
+
+from nagare import i18n, local
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'locale')
+MESSAGES = ['hello', 'unknown'] * 50
+
+
+def setup():
+    local.request = local.Process()
+    i18n.set_locale(i18n.Locale('fr', 'FR', dirname=LOCALE_DIR))
+
+
+def bench_gettext():
+    setup()
+
+    return lambda: i18n.gettext('hello')
+
+
+def bench_gettext_with_keywords():
+    setup()
+
+    return lambda: i18n.gettext('Holidays', year=2010)
+
+
+def bench_ungettext():
+    setup()
+
+    return lambda: i18n.ungettext('horse', 'horses', 3)
+
+
+def bench_ungettext_with_keywords():
+    setup()
+
+    return lambda: i18n.ungettext('horse', 'horses', 3, count=3)
+
+
+def bench_lazy_proxy_evaluation():
+    setup()
+
+    return lambda: str(i18n.lazy_ugettext('hello'))
+
+
+def bench_lazy_proxy_repeated_evaluation():
+    setup()
+    s = i18n.lazy_ugettext('hello')
+
+    return lambda: str(s)
+
+
+def bench_ugettext_100_messages():
+    setup()
+
+    return lambda: [i18n._(msg) for msg in MESSAGES]
+
+
+def bench_ugettext_many_100_messages():
+    setup()
+
+    return lambda: i18n.ugettext_many(MESSAGES)
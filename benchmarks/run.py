@@ -0,0 +1,95 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+"""Benchmarks runner.
+
+Each ``bench_*.py`` module of this directory defines ``bench_*()`` functions.
+A benchmark function does its setup then returns the callable to time.
+
+The results can be saved as JSON then compared with the results of a next run.
+
+Usage: ``python benchmarks/run.py [-k PATTERN] [-r REPEAT] [-o RESULTS.json] [-c BASELINE.json]``
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import timeit
+import inspect
+import argparse
+import platform
+import importlib.util
+
+
+def load_benchmarks(directory, pattern=None):
+    for filename in sorted(glob.glob(os.path.join(directory, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(filename))[0]
+
+        spec = importlib.util.spec_from_file_location(module_name, filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        for name, f in vars(module).items():
+            if inspect.isfunction(f) and name.startswith('bench_'):
+                name = module_name[6:] + '.' + name[6:]
+                if (pattern is None) or (pattern in name):
+                    yield name, f
+
+
+def measure(f, repeat):
+    timer = timeit.Timer(f())
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def read_results(filename):
+    with open(filename) as f:
+        return json.load(f)['benchmarks']
+
+
+def write_results(filename, results):
+    environment = {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+    with open(filename, 'w') as f:
+        json.dump({'environment': environment, 'benchmarks': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='i18n benchmarks')
+    parser.add_argument('-k', '--pattern', help='only run the benchmarks whose name contains this pattern')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of measures per benchmark')
+    parser.add_argument('-o', '--output', help='JSON file where to write the results')
+    parser.add_argument('-c', '--compare', help='JSON results of a previous run to compare with')
+    args = parser.parse_args(argv)
+
+    baseline = read_results(args.compare) if args.compare else {}
+    results = {}
+
+    for name, f in load_benchmarks(os.path.dirname(os.path.abspath(__file__)), args.pattern):
+        duration = results[name] = measure(f, args.repeat)
+
+        line = '{:60} {:12.3f} µs'.format(name, duration * 1e6)
+        if name in baseline:
+            line += '  {:12.3f} µs  x{:.2f}'.format(baseline[name] * 1e6, baseline[name] / duration)
+        print(line)
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
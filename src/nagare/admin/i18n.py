@@ -8,16 +8,186 @@
 # --
 
 import os
+import json
+import time
 import types
+import shutil
+import struct
+import hashlib
+import logging
 from tempfile import NamedTemporaryFile
+from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor
 
+import babel
 from babel import Locale, localedata
+from babel.util import pathmatch
+from babel.messages.pofile import write_po
+from babel.messages.catalog import DEFAULT_HEADER, Catalog
+from babel.messages.extract import check_and_call_extract_file
 from babel.messages.frontend import CommandLineInterface
 
+from nagare.i18n import hash_string
 from nagare.admin import command
 from nagare.server.reference import load_object, is_reference
 
 
+class LogRecorder:
+    """Logger keeping the log calls to replay them later."""
+
+    def __init__(self):
+        self.records = []
+
+    def log(self, level, msg, *args):
+        self.records.append((level, msg, args))
+
+    def debug(self, msg, *args):
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(logging.ERROR, msg, *args)
+
+
+def compile_catalog(options):
+    """Compile a catalog in a worker process.
+
+    In:
+      - ``options`` -- options of the babel ``compile`` command
+
+    Return:
+      - the command status and its log calls
+    """
+    command = CommandLineInterface.command_classes['compile']()
+    command.log = LogRecorder()
+
+    command.initialize_options()
+    command.__dict__.update(options)
+    command.finalize_options()
+
+    r = command.run()
+    if os.path.isfile(options['output_file']):
+        write_hash_table(options['output_file'])
+
+    return r, command.log.records
+
+
+def get_hash_size(n):
+    """Size of the hash table of ``n`` messages, as ``msgfmt`` computes it: the next prime after ``4n/3``."""
+    size = max(3, n * 4 // 3)
+    while any(size % i == 0 for i in range(2, int(size**0.5) + 1)):
+        size += 1
+
+    return size
+
+
+def write_hash_table(mo_file):
+    """Rewrite a ``MO`` file compiled by babel with the GNU hash table of its messages.
+
+    So the messages of the memory mapped files are found without any per process index.
+
+    In:
+      - ``mo_file`` -- the ``MO`` file, not yet used
+    """
+    with open(mo_file, 'rb') as f:
+        mo = f.read()
+
+    order = '<' if struct.unpack_from('<I', mo)[0] == 0x950412DE else '>'
+    magic, revision, n, originals, translations, hash_size, _ = struct.unpack_from(order + '7I', mo)
+    if hash_size:
+        return
+
+    tables = [struct.unpack_from(order + '%dI' % (n * 2), mo, table) for table in (originals, translations)]
+    strings = [[mo[offset : offset + length] for length, offset in zip(table[::2], table[1::2])] for table in tables]
+
+    hash_size = get_hash_size(n)
+    hash_table = [0] * hash_size
+    for i, original in enumerate(strings[0]):
+        h = hash_string(original.partition(b'\0')[0])
+        index = h % hash_size
+        while hash_table[index]:
+            index = (index + 1 + h % (hash_size - 2)) % hash_size
+        hash_table[index] = i + 1
+
+    originals = 28
+    translations = originals + n * 8
+    hash_offset = translations + n * 8
+    offset = hash_offset + hash_size * 4
+
+    headers = [magic, revision, n, originals, translations, hash_size, hash_offset]
+    data = []
+    for table in strings:
+        for string in table:
+            headers += [len(string), offset]
+            data.append(string + b'\0')
+            offset += len(string) + 1
+
+    with open(mo_file, 'wb') as f:
+        f.write(struct.pack(order + '%dI' % len(headers), *headers))
+        f.write(struct.pack(order + '%dI' % hash_size, *hash_table))
+        f.writelines(data)
+
+
+def extract_file(filepath, method_map, options_map, keywords, comment_tags, strip_comment_tags, dirpath):
+    """Extract the messages of a file, in a worker process.
+
+    Return:
+      - the (filename, lineno, message, comments, context) tuples
+    """
+    return list(
+        check_and_call_extract_file(
+            filepath, method_map, options_map, None, keywords, comment_tags, strip_comment_tags, dirpath
+        )
+    )
+
+
+def make_directory_filter(dirname, method_map):
+    """Default babel directories filter: no hidden or ignored directories."""
+
+    def directory_filter(path):
+        subdir = os.path.basename(path)
+        if subdir.startswith(('.', '_')):
+            return False
+
+        path = os.path.relpath(path, dirname).replace(os.sep, '/')
+        return not any((method == 'ignore') and pathmatch(pattern, path) for pattern, method in method_map)
+
+    return directory_filter
+
+
+class RelativeLocations:
+    """File wrapper removing a root directory from the location comments written."""
+
+    def __init__(self, f, root):
+        """Initialization.
+
+        In:
+          - ``f`` -- the binary file
+          - ``root`` -- the directory to remove
+        """
+        self.f = f
+        self.prefix = b'#: ' + os.path.join(root, '').encode('utf-8')
+        self.line = b''  # Incomplete line
+
+    def write(self, data):
+        *lines, self.line = (self.line + data).split(b'\n')
+
+        for line in lines:
+            if line.startswith(self.prefix):
+                line = b'#: ' + line[len(self.prefix) :]
+
+            self.f.write(line + b'\n')
+
+    def flush(self):
+        self.f.write(self.line)
+        self.line = b''
+
+
 class Commands(command.Commands):
     DESC = 'i18n catalogs management subcommands'
 
@@ -62,6 +232,10 @@ class Command(command.Command):
         command.__dict__.update(config)
         command.finalize_options()
 
+        return self.execute_command(command)
+
+    @staticmethod
+    def execute_command(command):
         return command.run()
 
     def run(self, i18n_service, services_service, **params):
@@ -92,14 +266,18 @@ class Extract(Command):
             project='$app_name', version='$app_version', input_dirs='$root', output_file='$data/locale/messages.pot'
         )
 
-    def create_logger(self, command, i18n_service, _output_file, **config):
-        logger = super().create_logger(command, i18n_service, **config)
-        logger.info = lambda msg, *args: self.log_info(
-            msg, *((_output_file,) if msg == 'writing PO template file to %s' else args)
-        )
-
     def run_command(
-        self, command, _root, input_dirs, output_file, keywords, relative_location, services_service, **config
+        self,
+        command,
+        _root,
+        input_dirs,
+        output_file,
+        keywords,
+        relative_location,
+        services_service,
+        jobs=1,
+        cache_directory='',
+        **config,
     ):
         input_dirs = [load_object(d)[1] if is_reference(d) else d.strip() for d in input_dirs]
 
@@ -112,28 +290,234 @@ class Extract(Command):
             'ungettext:1,2 , lazy_gettext , lazy_ugettext , lazy_ngettext:1,2 , lazy_ungettext:1,2'
         )
 
-        with NamedTemporaryFile('rb') as temp:
-            r = services_service(
-                super().run_command,
-                command,
-                input_dirs=input_dirs,
-                output_file=temp.name,
-                keywords=keywords,
-                _output_file=output_file,
-                **config,
-            )
+        if cache_directory != '-':
+            cache_directory = cache_directory or self.get_cache_directory(output_file)
+
+        return services_service(
+            super().run_command,
+            command,
+            input_dirs=input_dirs,
+            output_file=output_file,
+            keywords=keywords,
+            _root=_root if relative_location else None,
+            _jobs=jobs,
+            _cache_directory=None if cache_directory == '-' else cache_directory,
+            **config,
+        )
 
-            prefix = b'#: ' + _root.encode('utf8')
-            root_len = len(_root)
+    @staticmethod
+    def get_cache_directory(output_file):
+        """Return the default directory of the extraction results, in the user cache directory.
 
-            with open(output_file, 'wb') as outfile:
-                for line in temp:
-                    if relative_location and line.startswith(prefix):
-                        line = b'#: ' + line[root_len + 4 :]
+        In:
+          - ``output_file`` -- the PO template file
 
-                    outfile.write(line)
+        Return:
+          - a directory dedicated to the template file
+        """
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        key = hashlib.sha256(os.path.abspath(output_file).encode('utf-8')).hexdigest()[:16]
 
-        return r
+        return os.path.join(cache_home, 'nagare', 'i18n', '{}-{}'.format(os.path.basename(output_file), key))
+
+    @staticmethod
+    def find_files(command, path, method_map):
+        """Return the files to extract messages from.
+
+        In:
+          - ``command`` -- the babel ``extract`` command
+          - ``path`` -- a file or a directory to scan
+          - ``method_map`` -- the (pattern, extraction method) tuples
+
+        Return:
+          - the (file path, base directory, relative filename, extraction method) tuples
+        """
+        if os.path.isfile(path):
+            dirname = os.getcwd()
+            filepaths = [path]
+        else:
+            dirname = os.path.abspath(path)
+            directory_filter = getattr(command, 'directory_filter', None) or make_directory_filter(dirname, method_map)
+
+            filepaths = []
+            for root, dirnames, filenames in os.walk(dirname):
+                dirnames[:] = sorted(subdir for subdir in dirnames if directory_filter(os.path.join(root, subdir)))
+                filepaths.extend(os.path.join(root, filename).replace(os.sep, '/') for filename in sorted(filenames))
+
+        files = []
+        for filepath in filepaths:
+            filename = os.path.relpath(filepath, dirname).replace(os.sep, '/')
+            method = next((method for pattern, method in method_map if pathmatch(pattern, filename)), 'ignore')
+            if method != 'ignore':
+                files.append((filepath, dirname, filename, method))
+
+        return files
+
+    @staticmethod
+    def read_cache(cache_directory, key):
+        try:
+            with open(os.path.join(cache_directory, key + '.json'), encoding='utf-8') as f:
+                messages = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return [
+            (lineno, tuple(message) if isinstance(message, list) else message, comments, context)
+            for lineno, message, comments, context in messages
+        ]
+
+    @staticmethod
+    def write_cache(cache_directory, key, messages):
+        with open(os.path.join(cache_directory, key + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(messages, f)
+
+    def execute_command(self, command):
+        """Extract the messages, from the cache for the unchanged files.
+
+        The messages of the changed files are extracted in parallel.
+        """
+        cache_directory = command._cache_directory
+        if cache_directory and not os.path.exists(cache_directory):
+            os.makedirs(cache_directory)
+
+        catalog = Catalog(
+            project=command.project,
+            version=command.version,
+            msgid_bugs_address=command.msgid_bugs_address,
+            copyright_holder=command.copyright_holder,
+            charset=command.charset,
+            header_comment=getattr(command, 'header_comment', None) or DEFAULT_HEADER,
+            last_translator=getattr(command, 'last_translator', None),
+        )
+
+        extractions = []  # (path, filename, cache key, messages)
+        changed = []  # (extraction, extract_file arguments)
+
+        for path, method_map, options_map in command._get_mappings():
+            parameters = repr(
+                (
+                    babel.__version__,
+                    method_map,
+                    sorted(options_map.items()),
+                    command.keywords,
+                    command.add_comments,
+                    command.strip_comments,
+                )
+            ).encode('utf-8')
+
+            for filepath, dirname, filename, method in self.find_files(command, path, method_map):
+                with open(filepath, 'rb') as f:
+                    key = hashlib.sha256(parameters + filename.encode('utf-8') + f.read()).hexdigest()
+
+                extraction = [path, filename, key, cache_directory and self.read_cache(cache_directory, key)]
+                extractions.append(extraction)
+
+                if extraction[3] is None:
+                    changed.append(
+                        (
+                            extraction,
+                            (
+                                filepath,
+                                method_map,
+                                options_map,
+                                command.keywords,
+                                command.add_comments,
+                                command.strip_comments,
+                                dirname,
+                            ),
+                        )
+                    )
+
+        for extraction, _ in changed:
+            filepath = extraction[0] if os.path.isfile(extraction[0]) else os.path.join(*extraction[:2])
+            command.log.info('extracting messages from %s', os.path.normpath(filepath))
+
+        if command._jobs > 1 and len(changed) > 1:
+            with ProcessPoolExecutor(command._jobs) as executor:
+                results = list(executor.map(extract_file, *zip(*(args for _, args in changed))))
+        else:
+            results = [extract_file(*args) for _, args in changed]
+
+        for (extraction, _), messages in zip(changed, results):
+            extraction[3] = [(lineno, message, comments, context) for _, lineno, message, comments, context in messages]
+            if cache_directory:
+                self.write_cache(cache_directory, extraction[2], extraction[3])
+
+        command.log.info('%d files extracted, %d from the cache', len(extractions), len(extractions) - len(changed))
+
+        for path, filename, _, messages in extractions:
+            filepath = filename if os.path.isfile(path) else os.path.normpath(os.path.join(path, filename))
+
+            for lineno, message, comments, context in messages:
+                catalog.add(message, None, [(filepath, lineno)], auto_comments=comments, context=context)
+
+        if cache_directory:
+            keys = {extraction[2] + '.json' for extraction in extractions}
+            for filename in os.listdir(cache_directory):
+                if filename.endswith('.json') and (filename not in keys):
+                    os.remove(os.path.join(cache_directory, filename))
+
+        command.log.info('writing PO template file to %s', command.output_file)
+        if not self.write_template(
+            command.output_file,
+            catalog,
+            command._root,
+            width=command.width,
+            no_location=command.no_location,
+            omit_header=command.omit_header,
+            sort_output=command.sort_output,
+            sort_by_file=command.sort_by_file,
+            include_lineno=command.include_lineno,
+        ):
+            command.log.info('PO template file %s unchanged', command.output_file)
+
+    @staticmethod
+    def is_same_template(filename1, filename2):
+        """Compare two templates, ignoring their creation dates."""
+        if not os.path.isfile(filename2):
+            return False
+
+        with open(filename1, 'rb') as f1, open(filename2, 'rb') as f2:
+            lines1 = (line for line in f1 if not line.startswith(b'"POT-Creation-Date:'))
+            lines2 = (line for line in f2 if not line.startswith(b'"POT-Creation-Date:'))
+
+            return all(line1 == line2 for line1, line2 in zip_longest(lines1, lines2))
+
+    def write_template(self, output_file, catalog, root=None, **options):
+        """Atomically write the template file, if its content changed.
+
+        In:
+          - ``output_file`` -- the template file
+          - ``catalog`` -- the messages
+          - ``root`` -- if not ``None``, the locations are written relative to this directory
+          - ``options`` -- ``write_po()`` options
+
+        Return:
+          - is the template file written?
+        """
+        output_dir, filename = os.path.split(output_file)
+        with NamedTemporaryFile('wb', dir=output_dir, prefix='.' + filename, delete=False) as outfile:
+            try:
+                f = outfile if root is None else RelativeLocations(outfile, root)
+                write_po(f, catalog, **options)
+                f.flush()
+            except Exception:
+                os.remove(outfile.name)
+                raise
+
+        if self.is_same_template(outfile.name, output_file):
+            os.remove(outfile.name)
+            return False
+
+        if os.path.isfile(output_file):
+            shutil.copymode(output_file, outfile.name)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(outfile.name, 0o666 & ~umask)
+
+        os.replace(outfile.name, output_file)
+        return True
 
 
 class Init(Command):
@@ -175,6 +559,8 @@ class Update(Command):
 class Compile(Command):
     def set_arguments(self, parser):
         parser.add_argument('-l', '--locale').completer = lambda **kw: localedata.locale_identifiers()
+        parser.add_argument('--force', action='store_true', help='also compile the up to date catalogs')
+        parser.add_argument('--jobs', type=int, default=1, help='number of catalogs compiled in parallel')
         super().set_arguments(parser)
 
     @classmethod
@@ -185,9 +571,106 @@ class Compile(Command):
             domain='${/i18n/init/domain}',
         )
 
-    def run_command(self, command, input_file, directory, services_service, **config):
+    @staticmethod
+    def find_catalogs(directory, locale=None, domain=None):
+        """Return the (locale, domain, PO file, MO file) of the catalogs.
+
+        In:
+          - ``directory`` -- base directory of the catalogs
+          - ``locale`` -- only the catalogs of this locale
+          - ``domain`` -- space separated list of domains (default ``messages``)
+        """
+        catalogs = []
+
+        for locale in [locale] if locale else sorted(os.listdir(directory)):
+            for domain in (domain or 'messages').split():
+                po_file = os.path.join(directory, locale, 'LC_MESSAGES', domain + '.po')
+                if os.path.isfile(po_file):
+                    catalogs.append((locale, domain, po_file, po_file[:-3] + '.mo'))
+
+        return catalogs
+
+    @staticmethod
+    def get_temporary_file(mo_file):
+        dirname, filename = os.path.split(mo_file)
+        return os.path.join(dirname, '.{}.{}'.format(filename, os.getpid()))
+
+    @staticmethod
+    def replace_file(tmp_file, mo_file):
+        """Atomically replace a ``MO`` file by its new compiled version, if written."""
+        if os.path.isfile(tmp_file):
+            os.replace(tmp_file, mo_file)
+
+    @staticmethod
+    def is_up_to_date(po_file, mo_file):
+        return os.path.isfile(mo_file) and (os.path.getmtime(mo_file) >= os.path.getmtime(po_file))
+
+    def run_command(
+        self, command, input_file, directory, locale, domain, output_file, i18n_service, services_service, **config
+    ):
+        force = config.pop('force', False)
+        jobs = config.pop('jobs', None) or 1
+
         directory = directory or os.path.dirname(input_file)
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        return services_service(super().run_command, command, directory=directory, **config)
+        if output_file:
+            return services_service(
+                super().run_command,
+                command,
+                directory=directory,
+                locale=locale,
+                domain=domain,
+                output_file=output_file,
+                **config,
+            )
+
+        catalogs = self.find_catalogs(directory, locale, domain)
+        if not force:
+            catalogs = [catalog for catalog in catalogs if not self.is_up_to_date(*catalog[2:])]
+
+        if not catalogs:
+            i18n_service.logger.info('catalogs are up to date')
+            return 0
+
+        start = time.perf_counter()
+
+        # The catalogs are compiled into temporary files then moved, so the mapped MO files are never rewritten
+        mo_files = [(self.get_temporary_file(mo_file), mo_file) for _, _, _, mo_file in catalogs]
+        catalogs_options = [
+            dict(config, directory=directory, locale=locale, domain=domain, input_file=po_file, output_file=tmp_file)
+            for (locale, domain, po_file, _), (tmp_file, _) in zip(catalogs, mo_files)
+        ]
+
+        results = []
+        try:
+            if jobs == 1:
+                for options, (tmp_file, mo_file) in zip(catalogs_options, mo_files):
+                    results.append(services_service(super().run_command, command, **options))
+                    if os.path.isfile(tmp_file):
+                        write_hash_table(tmp_file)
+
+                    self.replace_file(tmp_file, mo_file)
+            else:
+                with ProcessPoolExecutor(jobs) as executor:
+                    for (r, records), (tmp_file, mo_file) in zip(
+                        executor.map(compile_catalog, catalogs_options), mo_files
+                    ):
+                        for level, msg, args in records:
+                            i18n_service.logger.log(level, msg, *args)
+
+                        results.append(r)
+                        self.replace_file(tmp_file, mo_file)
+        finally:
+            for tmp_file, _ in mo_files:
+                if os.path.isfile(tmp_file):
+                    os.remove(tmp_file)
+
+        n_errors = len(list(filter(None, results)))
+        if n_errors:
+            i18n_service.logger.error('%d of %d catalogs with errors', n_errors, len(results))
+
+        i18n_service.logger.info('%d catalogs compiled in %.3fs', len(results), time.perf_counter() - start)
+
+        return 1 if n_errors else 0
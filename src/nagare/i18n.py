@@ -9,30 +9,218 @@
 
 """Internationalization service."""
 
+import os
+import sys
+import copy
+import mmap
+import time
+import heapq
+import struct
+import gettext as gnu_gettext
 import datetime
+import threading
+import contextvars
+from array import array
+from bisect import bisect_right
 from operator import itemgetter
+from functools import partial
+from threading import get_ident
 
 import pytz
 from babel import Locale as CoreLocale
-from babel import core, dates, lists, numbers, support, languages, negotiate_locale
+from babel import core, dates, lists, numbers, support, languages, localedata, negotiate_locale
 
 from nagare import local
 
+try:
+    import zoneinfo
+except ImportError:  # pragma: no cover
+    zoneinfo = None
+
+_default_locale = None  # Locale used outside of a request
+
+
+def get_default_locale():
+    global _default_locale
+
+    if _default_locale is None:
+        _default_locale = get_shared_locale()
+
+    return _default_locale
+
+
+def set_default_locale(locale):
+    global _default_locale
+
+    _default_locale = locale
+
+
+class RequestLocaleStorage:
+    """Current locale kept by the ``nagare.local.request`` object."""
+
+    @staticmethod
+    def get():
+        return getattr(local.request, 'nagare_locale', None)
+
+    @staticmethod
+    def set(locale):
+        """Set the current locale.
+
+        Return:
+          - the previous locale, to restore it with ``reset()``
+        """
+        request = local.request
+
+        previous_locale = getattr(request, 'nagare_locale', None)
+        request.nagare_locale = locale
+
+        return previous_locale
+
+    @staticmethod
+    def reset(previous_locale):
+        local.request.nagare_locale = previous_locale
+
+    @staticmethod
+    def push(locale):
+        """Set the current locale, keeping the previous one."""
+        request = local.request
+
+        previous_locales = getattr(request, 'nagare_previous_locales', None)
+        if previous_locales is None:
+            previous_locales = request.nagare_previous_locales = []
+
+        previous_locales.append(getattr(request, 'nagare_locale', None))
+        request.nagare_locale = locale
+
+    @staticmethod
+    def pop():
+        """Restore the previous current locale."""
+        request = local.request
+        request.nagare_locale = request.nagare_previous_locales.pop()
+
+
+class ContextVarLocaleStorage:
+    """Current locale kept by a context variable.
+
+    Each asyncio task, or function run with ``contextvars.copy_context().run()``,
+    (i.e by ``asyncio.to_thread()``) sees the locale of its own context.
+    """
+
+    def __init__(self):
+        self.locale = contextvars.ContextVar('nagare_locale', default=None)
+        self.tokens = contextvars.ContextVar('nagare_locale_tokens', default=())
+
+        self.get = self.locale.get
+
+    def set(self, locale):
+        """Set the current locale.
+
+        Return:
+          - the token to restore the previous locale with ``reset()``
+        """
+        return self.locale.set(locale)
+
+    def reset(self, token):
+        self.locale.reset(token)
+
+    def push(self, locale):
+        """Set the current locale, keeping the previous one."""
+        self.tokens.set(self.tokens.get() + (self.locale.set(locale),))
+
+    def pop(self):
+        """Restore the previous current locale."""
+        tokens = self.tokens.get()
+        self.tokens.set(tokens[:-1])
+        self.locale.reset(tokens[-1])
+
+
+LOCALE_STORAGES = {'local': RequestLocaleStorage(), 'contextvars': ContextVarLocaleStorage()}
+
+_locale_storage = LOCALE_STORAGES['local']  # Where the current locale is kept
+
+
+def set_locale_storage(storage):
+    """Select where the current locale is kept.
+
+    In:
+      - ``storage`` -- ``local`` for the ``nagare.local.request`` object or ``contextvars`` for a context variable
+    """
+    global _locale_storage
+
+    _locale_storage = LOCALE_STORAGES[storage]
+
 
 def get_locale():
-    return getattr(local.request, 'nagare_locale', Locale())
+    locale = _locale_storage.get()
+    return get_default_locale() if locale is None else locale
 
 
 def set_locale(locale):
-    local.request.nagare_locale = locale
+    """Set the current locale.
+
+    In:
+      - ``locale`` -- the new current locale
+
+    Return:
+      - the token to restore the previous current locale with ``reset_locale()``
+    """
+    return _locale_storage.set(locale)
+
+
+def reset_locale(token):
+    """Restore the current locale replaced by ``set_locale()``.
+
+    In:
+      - ``token`` -- value returned by ``set_locale()``
+    """
+    _locale_storage.reset(token)
 
 
 class LazyProxy(support.LazyProxy):
-    """Picklable ``babel.support.LazyProxy`` objects."""
+    """Picklable ``babel.support.LazyProxy`` objects.
+
+    The value is kept for the current locale and the loaded catalogs. It's
+    evaluated again when one of them changes.
+    """
+
+    __slots__ = ('_cached_value',)
 
     def __init__(self, func, *args, **kw):
-        """Always evaluate, without any cache."""
-        super().__init__(func, *args, enable_cache=True, **kw)
+        super().__init__(func, *args, enable_cache=False, **kw)
+        object.__setattr__(self, '_cached_value', None)  # (locale, catalog generation, value)
+
+    @property
+    def value(self):
+        locale = get_locale()
+        if (
+            isinstance(locale, LocaleView)
+            and (locale._translation_directories is None)
+            and (locale.domain == locale.locale.domain)
+        ):
+            locale = locale.locale  # Same translations as its shared locale
+
+        generation = _catalog_generation
+        cached_value = self._cached_value
+        if (cached_value is not None) and (cached_value[0] is locale) and (cached_value[1] == generation):
+            return cached_value[2]
+
+        try:
+            value = self._func(*self._args, **self._kwargs)
+        except AttributeError as error:
+            object.__setattr__(self, '_attribute_error', error)
+            raise
+
+        object.__setattr__(self, '_cached_value', (locale, generation, value))
+
+        return value
+
+    def __copy__(self):
+        return self.__class__(self._func, *self._args, **self._kwargs)
+
+    def __deepcopy__(self, memo):
+        return self.__class__(
+            copy.deepcopy(self._func, memo), *copy.deepcopy(self._args, memo), **copy.deepcopy(self._kwargs, memo)
+        )
 
     def __getstate__(self):
         return self._func, self._args, self._kwargs
@@ -67,6 +255,22 @@ def ungettext(singular, plural, n, domain=None, **kw):
 _N = ungettext  # noqa: E305
 
 
+def gettext_many(msgs, domain=None, **kw):
+    return get_locale().gettext_many(msgs, domain, **kw)
+
+
+def ugettext_many(msgs, domain=None, **kw):
+    return get_locale().ugettext_many(msgs, domain, **kw)
+
+
+def ngettext_many(singular, plural, ns, domain=None, **kw):
+    return get_locale().ngettext_many(singular, plural, ns, domain, **kw)
+
+
+def ungettext_many(singular, plural, ns, domain=None, **kw):
+    return get_locale().ungettext_many(singular, plural, ns, domain, **kw)
+
+
 def lazy_gettext(msg, domain=None, **kw):
     return LazyProxy(gettext, msg, domain, **kw)
 
@@ -93,6 +297,10 @@ def to_timezone(dt=None):
     return get_locale().to_timezone(dt)
 
 
+def to_timezone_many(dts):
+    return get_locale().to_timezone_many(dts)
+
+
 def to_utc(dt=None):
     return get_locale().to_utc(dt)
 
@@ -105,6 +313,10 @@ def format_datetime(dt=None, format='medium'):
     return get_locale().format_datetime(dt, format)
 
 
+def format_datetime_many(dts, format='medium'):
+    return get_locale().format_datetime_many(dts, format)
+
+
 def format_date(d=None, format='medium'):
     return get_locale().format_date(d, format)
 
@@ -219,6 +431,26 @@ def format_scientific(number, format=None, decimal_quantization=True):
     return get_locale().format_scientific(number, format, decimal_quantization)
 
 
+def format_decimal_many(values, format=None, decimal_quantization=True):
+    return get_locale().format_decimal_many(values, format, decimal_quantization)
+
+
+def format_currency_many(
+    values, currency, format=None, currency_digits=True, format_type='standard', decimal_quantization=True
+):
+    return get_locale().format_currency_many(
+        values, currency, format, currency_digits, format_type, decimal_quantization
+    )
+
+
+def format_percent_many(values, format=None, decimal_quantization=True):
+    return get_locale().format_percent_many(values, format, decimal_quantization)
+
+
+def format_scientific_many(values, format=None, decimal_quantization=True):
+    return get_locale().format_scientific_many(values, format, decimal_quantization)
+
+
 def parse_number(string):
     return get_locale().parse_number(string)
 
@@ -265,11 +497,689 @@ def get_territory_currencies(start_date=None, end_date=None, tender=True, non_te
 # Locale API
 # ----------
 
-_translations_cache = {}  # Already loaded translation objects
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping bounded to a maximum number of entries.
+
+    Only the writers take the lock, the reads are single dictionary lookups,
+    atomic with or without the GIL. So they scale without contention when
+    the GIL is disabled.
+
+    Each entry records the number of insertions done when it was last used,
+    only updated once more than half of the maximum number of entries were
+    inserted since. When full, the entries with the lowest numbers are evicted
+    first: an approximation of the least recently used order where the reads
+    of the recently used entries don't write anything. The writers keep the
+    entries in a heap, by last use, lazily reordered on evictions.
+
+    The hits and misses are counted by thread, and only summed by ``stats``,
+    so the reads don't write any shared counter.
+    """
+
+    def __init__(self, max_size=None):
+        """Initialization.
+
+        In:
+          - ``max_size`` -- maximum number of entries (``None`` or ``0`` for no limit)
+        """
+        self.max_size = max_size
+        self.evictions = self.loads = 0
+        self.load_time = 0.0
+
+        self._entries = {}  # key -> [value, last use]
+        self._clock = 0  # Number of insertions
+        self._refresh_age = self.get_refresh_age(max_size)  # Number of insertions before a last use is updated
+        self._counters = {}  # [hits, misses] of each thread, by thread identifier
+        self._order = []  # Heap of the (last use, push number, key) tuples, one by entry
+        self._pushes = 0
+        self._lock = threading.Lock()  # Writers lock
+        self._loadings = {}  # Locks of the entries being loaded
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._entries))
+
+    def get(self, key, default=None):
+        """Return the value of an entry, marking it as recently used.
+
+        In:
+          - ``key`` -- key of the entry
+          - ``default`` -- value returned if the entry is not in the cache
+
+        Return:
+          - the value
+        """
+        entry = self._entries.get(key)
+        counters = self._counters.get(get_ident()) or self._add_counters()
+
+        if entry is None:
+            counters[1] += 1
+            return default
+
+        clock = self._clock
+        if (clock - entry[1]) >= self._refresh_age:
+            entry[1] = clock
+        counters[0] += 1
+
+        return entry[0]
+
+    def _add_counters(self):
+        """Create the counters of the current thread.
+
+        The identifiers of the ended threads are reused by the new ones, which
+        continue their counts. So the counters are bounded by the number of
+        concurrent threads.
+        """
+        with self._lock:
+            return self._counters.setdefault(get_ident(), [0, 0])
+
+    @staticmethod
+    def get_refresh_age(max_size):
+        return max(1, max_size // 2) if max_size else sys.maxsize
+
+    def get_or_load(self, key, loader, *args):
+        """Return the value of an entry, loading it if not in the cache.
+
+        Only one loader is called at a time for a given key, the concurrent
+        accesses wait for its result.
+
+        In:
+          - ``key`` -- key of the entry
+          - ``loader`` -- function called with ``args`` to create the value
+
+        Return:
+          - the value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            loading = self._loadings.setdefault(key, threading.Lock())
+
+        with loading:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = self._clock
+                return entry[0]
+
+            start = time.perf_counter()
+            try:
+                value = loader(*args)
+            except BaseException:
+                with self._lock:
+                    self._loadings.pop(key, None)
+                raise
+
+            with self._lock:
+                self.loads += 1
+                self.load_time += time.perf_counter() - start
+
+                # Published before the loading lock is released for the next accesses
+                self._publish(key, value)
+                self._loadings.pop(key, None)
+
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._publish(key, value)
+
+    def _publish(self, key, value):
+        """Add or replace an entry, evicting the least recently used ones if full."""
+        self._clock += 1
+
+        if key not in self._entries:
+            self._push(key, self._clock)
+        # Else the heap position of the entry will be updated on eviction
+
+        self._entries[key] = [value, self._clock]
+        self._evict()
+
+    def _push(self, key, last_use):
+        self._pushes += 1
+        heapq.heappush(self._order, (last_use, self._pushes, key))
+
+    def _evict(self):
+        while self.max_size and (len(self._entries) > self.max_size):
+            last_use, _, key = heapq.heappop(self._order)
+
+            entry = self._entries[key]
+            if entry[1] != last_use:
+                self._push(key, entry[1])  # Used since pushed
+            else:
+                del self._entries[key]
+                self.evictions += 1
+
+    def resize(self, max_size):
+        """Change the maximum number of entries, evicting the exceeding ones.
+
+        In:
+          - ``max_size`` -- maximum number of entries (``None`` or ``0`` for no limit)
+        """
+        with self._lock:
+            self.max_size = max_size
+            self._refresh_age = self.get_refresh_age(max_size)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._order = []
+
+    @property
+    def stats(self):
+        counters = list(self._counters.values())
+
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': sum(hits for hits, _ in counters),
+            'misses': sum(misses for _, misses in counters),
+            'evictions': self.evictions,
+            'loads': self.loads,
+            'load_time': self.load_time,
+        }
+
+
+def hash_string(s):
+    """GNU gettext hash function of the ``MO`` files hash tables."""
+    h = 0
+    for c in s:
+        h = ((h << 4) + c) & 0xFFFFFFFF  # 32 bits arithmetic
+        g = h & 0xF0000000
+        if g:
+            h ^= (g >> 24) ^ g
+
+    return h
+
+
+class MappedTranslations(support.NullTranslations):
+    """Translations read from a memory mapped ``MO`` file.
+
+    The messages are searched with the hash table of the file (written by the
+    ``compile`` command), or by binary search, and only the found translations
+    are decoded. The file pages are shared by all the processes using it.
+
+    A mapped file must be replaced (i.e by ``os.replace()``, as the ``compile``
+    command does), never rewritten in place: the processes accessing a
+    truncated mapping are killed by a ``SIGBUS``.
+    """
+
+    def __init__(self, filename, domain=None):
+        """Initialization.
+
+        In:
+          - ``filename`` -- the ``MO`` file
+          - ``domain`` -- the messages domain
+        """
+        super().__init__()
+        self.domain = domain or support.Translations.DEFAULT_DOMAIN
+        self.plural = lambda n: int(n != 1)
+        self._info = {}
+        self._charset = None
+        self._indexes = {}  # Already searched messages
+
+        with open(filename, 'rb') as f:
+            self._mo = mo = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic = struct.unpack_from('<I', mo)[0]
+        if magic == gnu_gettext.GNUTranslations.LE_MAGIC:
+            self._order = '<'
+        elif magic == gnu_gettext.GNUTranslations.BE_MAGIC:
+            self._order = '>'
+        else:
+            raise OSError(0, 'Bad magic number', filename)
+
+        revision, self._n, self._originals, self._translations, self._hash_size, self._hash_table = struct.unpack_from(
+            self._order + '6I', mo, 4
+        )
+        if (revision >> 16) not in gnu_gettext.GNUTranslations.VERSIONS:
+            raise OSError(0, 'Bad version number ' + str(revision >> 16), filename)
+
+        # Without hash table, the binary search needs the indexes of the messages ordered as
+        # bytes. Checked on the first search, not to read all the messages at load time
+        self._key_order = None
+
+        # The metadata, with the empty message id, are normally the first message
+        i = 0 if self._n and not self._get_key(0) else self._search(b'')
+        if i is not None:
+            self._parse_metadata(self._get_string(self._translations, i).decode('ascii', 'replace'))
+
+    @classmethod
+    def load(cls, dirname=None, locales=None, domain=None):
+        """Load the translations from the ``MO`` file of a locale and a domain.
+
+        In:
+          - ``dirname`` -- the directory containing the ``MO`` files
+          - ``locales`` -- the locale identifier (i.e ``fr_FR``)
+          - ``domain`` -- the messages domain
+
+        Return:
+          - the translations, empty if no ``MO`` file is found
+        """
+        domain = domain or support.Translations.DEFAULT_DOMAIN
+        filename = gnu_gettext.find(domain, dirname, [str(locales)] if locales else None)
+
+        return cls(filename, domain) if filename else support.NullTranslations()
+
+    def _parse_metadata(self, metadata):
+        for line in metadata.splitlines():
+            name, _, value = line.partition(':')
+            name = name.strip().lower()
+            value = value.strip()
+            if not name:
+                continue
+
+            self._info[name] = value
+            if name == 'content-type':
+                self._charset = value.partition('charset=')[2] or None
+            elif name == 'plural-forms':
+                self.plural = gnu_gettext.c2py(value.partition('plural=')[2].rstrip(';'))
+
+    def _get_string(self, table, i):
+        length, offset = struct.unpack_from(self._order + '2I', self._mo, table + i * 8)
+        return self._mo[offset : offset + length]
+
+    def _get_key(self, i):
+        return self._get_string(self._originals, i).partition(b'\0')[0]
+
+    def _search(self, key):
+        """Return the index of a message (``None`` if not found)."""
+        if self._hash_size > 2:
+            h = hash_string(key)
+            i = h % self._hash_size
+            incr = 1 + (h % (self._hash_size - 2))
+
+            while True:
+                n = struct.unpack_from(self._order + 'I', self._mo, self._hash_table + i * 4)[0]
+                if not n:
+                    return None
+
+                if self._get_key(n - 1) == key:
+                    return n - 1
+
+                i = (i + incr) % self._hash_size
+
+        key_order = self._key_order
+        if key_order is None:
+            key_order = self._key_order = self._sort_keys()
+
+        low, high = 0, self._n
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self._get_key(key_order[middle])
+            if middle_key == key:
+                return key_order[middle]
+
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def _sort_keys(self):
+        """Return the indexes of the messages, in the order of their keys.
+
+        The messages are normally already sorted, except with a message context
+        (``babel`` sorts them by message then context). Only the indexes are kept,
+        the keys staying in the mapped file.
+        """
+        previous_key = None
+        for i in range(self._n):
+            key = self._get_key(i)
+            if (previous_key is not None) and (key <= previous_key):
+                return array('I', sorted(range(self._n), key=self._get_key))
+
+            previous_key = key
+
+        return range(self._n)
+
+    def _lookup(self, message, context=None):
+        """Return the translated forms of a message (``None`` if not found)."""
+        i = self._indexes.get((message, context), -1)
+        if i == -1:
+            key = message if context is None else (context + '\x04' + message)
+            i = self._indexes[(message, context)] = self._search(key.encode(self._charset or 'ascii'))
+
+        if i is None:
+            return None
+
+        is_plural = b'\0' in self._get_string(self._originals, i)
+        translation = self._get_string(self._translations, i).decode(self._charset or 'ascii')
+
+        return translation.split('\0') if is_plural else translation
+
+    def _gettext(self, message, context=None):
+        translation = self._lookup(message, context)
+        if isinstance(translation, list):
+            translation = translation[self.plural(1)] if self.plural(1) < len(translation) else None
+
+        return message if translation is None else translation
+
+    def _ngettext(self, singular, plural, n, context=None):
+        translations = self._lookup(singular, context)
+        if isinstance(translations, list):
+            i = self.plural(n)
+            if i < len(translations):
+                return translations[i]
+
+        return singular if n == 1 else plural
+
+    def gettext(self, message):
+        if self._fallback and (self._lookup(message) is None):
+            return self._fallback.gettext(message)
+
+        return self._gettext(message)
+
+    def ngettext(self, singular, plural, n):
+        if self._fallback and not isinstance(self._lookup(singular), list):
+            return self._fallback.ngettext(singular, plural, n)
+
+        return self._ngettext(singular, plural, n)
+
+    def pgettext(self, context, message):
+        if self._fallback and (self._lookup(message, context) is None):
+            return self._fallback.pgettext(context, message)
+
+        return self._gettext(message, context)
+
+    def npgettext(self, context, singular, plural, n):
+        if self._fallback and not isinstance(self._lookup(singular, context), list):
+            return self._fallback.npgettext(context, singular, plural, n)
+
+        return self._ngettext(singular, plural, n, context)
+
+    ugettext = gettext
+    ungettext = ngettext
+    upgettext = pgettext
+    unpgettext = npgettext
+
+
+TRANSLATIONS_BACKENDS = {'babel': support.Translations, 'mmap': MappedTranslations}
+
+_translations_backend = support.Translations  # Class loading the translation objects
+_translations_cache = LRUCache()  # Already loaded translation objects, by MO file
+_translation_files = {}  # Resolved MO files, by (directory, locale, domain)
+_catalog_generation = 0  # Incremented each time the loaded translation objects change
 
 
 def invalidate_caches():
+    global _catalog_generation
+
     _translations_cache.clear()
+    _translation_files.clear()
+    _catalog_generation += 1
+
+
+def set_translations_backend(backend):
+    """Select how the ``MO`` files are loaded.
+
+    In:
+      - ``backend`` -- ``babel`` to parse the whole files or ``mmap`` to map them in memory
+    """
+    global _translations_backend
+
+    _translations_backend = TRANSLATIONS_BACKENDS[backend]
+    invalidate_caches()
+
+
+def set_translations_cache_size(max_size):
+    """Limit the number of loaded translation objects.
+
+    In:
+      - ``max_size`` -- maximum number of translation objects (``None`` or ``0`` for no limit)
+    """
+    _translations_cache.resize(max_size)
+
+
+def get_translations_cache_stats():
+    return _translations_cache.stats
+
+
+def load_translation(dirname, locale, domain=None):
+    """Load a translation object, if not already loaded.
+
+    In:
+      - ``dirname`` -- the directory containing the ``MO`` files
+      - ``locale`` -- the locale identifier (i.e ``fr_FR``)
+      - ``domain`` -- translation domain
+
+    Return:
+      - translation object
+    """
+    args = (dirname, locale, domain or support.Translations.DEFAULT_DOMAIN)
+
+    filename = _translation_files.get(args, _MISSING)
+    if filename is _MISSING:
+        filename = _translation_files[args] = find_translation_file(*args)
+
+    # The locales resolved to the same MO file (i.e ``fr`` and ``fr_FR``) share the translation object
+    return _translations_cache.get_or_load(filename or args, _translations_backend.load, *args)
+
+
+def find_translation_file(dirname, locale, domain):
+    """Return the ``MO`` file of a locale and a domain, as found by the backends.
+
+    In:
+      - ``dirname`` -- the directory containing the ``MO`` files
+      - ``locale`` -- the locale identifier (i.e ``fr_FR``)
+      - ``domain`` -- translation domain
+
+    Return:
+      - the file path or ``None`` if not found
+    """
+    return gnu_gettext.find(domain, dirname, [locale] if locale else None)
+
+
+def reload_translations(dirname, locale, domain=None):
+    """Reload the already loaded translation objects of a catalog.
+
+    The translation objects of the more specific locales (i.e ``fr_FR`` for ``fr``)
+    are reloaded too. The other ones are kept.
+
+    In:
+      - ``dirname`` -- the directory containing the ``MO`` files
+      - ``locale`` -- the locale identifier of the catalog (i.e ``fr``)
+      - ``domain`` -- translation domain of the catalog
+    """
+    global _catalog_generation
+
+    dirname = os.path.abspath(dirname)
+    domain = domain or support.Translations.DEFAULT_DOMAIN
+    reloaded = set()
+
+    for args, filename in list(_translation_files.items()):
+        translations_dirname, translations_locale, translations_domain = args
+
+        if (
+            (translations_dirname is not None)
+            and (translations_domain == domain)
+            and ((translations_locale == locale) or translations_locale.startswith((locale + '_', locale + '@')))
+            and (os.path.abspath(translations_dirname) == dirname)
+        ):
+            # The catalog can be a new, more specific, MO file
+            _translation_files[args] = new_filename = find_translation_file(*args)
+
+            key = new_filename or args
+            if ((filename or args) in _translations_cache) and (key not in reloaded):
+                _translations_cache[key] = _translations_backend.load(*args)
+                reloaded.add(key)
+
+    if reloaded:
+        _catalog_generation += 1
+
+
+TIMEZONE_BACKENDS = {'pytz': (pytz.timezone, pytz.UTC)}  # Timezone factory and UTC timezone
+if zoneinfo is not None:
+    TIMEZONE_BACKENDS['zoneinfo'] = (zoneinfo.ZoneInfo, datetime.timezone.utc)
+
+_timezone_backend = 'pytz'
+
+
+def set_timezone_backend(backend):
+    """Select how the locales create the timezones from their codes.
+
+    In:
+      - ``backend`` -- ``pytz`` or ``zoneinfo`` (Python 3.9+)
+    """
+    global _timezone_backend
+
+    if backend not in TIMEZONE_BACKENDS:
+        raise ValueError('unknown timezone backend: ' + backend)
+
+    _timezone_backend = backend
+
+
+_shared_timezones = {}  # Interned timezones, by (backend, code)
+
+
+def get_shared_timezone(code, backend=None):
+    """Return the process-wide timezone object of a code, created on first use.
+
+    In:
+      - ``code`` -- the timezone code (i.e ``America/Los_Angeles``)
+      - ``backend`` -- ``pytz`` or ``zoneinfo`` (default: the backend set by ``set_timezone_backend()``)
+
+    Return:
+      - the timezone object
+    """
+    key = (backend or _timezone_backend, code)
+
+    timezone = _shared_timezones.get(key)
+    if timezone is None:
+        timezone = _shared_timezones.setdefault(key, TIMEZONE_BACKENDS[key[0]][0](code))
+
+    return timezone
+
+
+def localize(dt, tzinfo):
+    """Associate a timezone to a naive datetime.
+
+    In:
+      - ``dt`` -- naive ``datetime`` object
+      - ``tzinfo`` -- pytz timezone or standard ``tzinfo`` object
+
+    Return:
+      - new localized ``datetime`` object
+    """
+    return tzinfo.localize(dt) if hasattr(tzinfo, 'localize') else dt.replace(tzinfo=tzinfo)
+
+
+class TimezoneConverter:
+    """Conversion of many datetimes to a timezone.
+
+    The UTC offsets of the pytz timezones are cached by transition period so,
+    while the successive datetimes stay in the same period, a conversion is
+    only an addition.
+    """
+
+    def __init__(self, tzinfo, default_timezone=None):
+        """Initialization.
+
+        In:
+          - ``tzinfo`` -- the target timezone
+          - ``default_timezone`` -- timezone of the naive datetimes (default: UTC)
+        """
+        self.tzinfo = tzinfo
+        self.default_timezone = default_timezone or pytz.UTC
+
+        self._local_period = (datetime.datetime.max, datetime.datetime.min, None)  # (start, end, offset)
+        self._utc_period = (datetime.datetime.max, datetime.datetime.min, None, None)  # (start, end, offset, tzinfo)
+
+    @staticmethod
+    def get_period(tzinfo, utc):
+        """Return the transition period of a pytz timezone containing a UTC time.
+
+        In:
+          - ``tzinfo`` -- pytz timezone
+          - ``utc`` -- naive UTC datetime
+
+        Return:
+          - (UTC start, UTC end, index of the period) or ``None`` if the timezone has no transitions
+        """
+        transitions = getattr(tzinfo, '_utc_transition_times', None)
+        if not transitions:
+            return None
+
+        i = max(0, bisect_right(transitions, utc) - 1)
+        end = transitions[i + 1] if (i + 1) < len(transitions) else datetime.datetime.max
+
+        return transitions[i], end, i
+
+    def to_utc(self, dt):
+        """Return the naive UTC time of a datetime, naive datetimes being in the default timezone."""
+        if dt.tzinfo is not None:
+            return dt.replace(tzinfo=None) - dt.utcoffset()
+
+        start, end, offset = self._local_period
+        if start <= dt < end:
+            return dt - offset
+
+        timezone = self.default_timezone
+
+        dt = localize(dt, timezone)
+        offset = dt.utcoffset()
+        utc = dt.replace(tzinfo=None) - offset
+
+        period = self.get_period(timezone, utc)
+        if period is not None:
+            start, end, i = period
+            if offset == timezone._transition_info[i][0]:  # Not a local time skipped by a transition
+                # Local times neither ambiguous nor skipped by the transitions around the period
+                if i:
+                    start += max(offset, timezone._transition_info[i - 1][0])
+                if end != datetime.datetime.max:
+                    end += min(offset, timezone._transition_info[i + 1][0])
+
+                self._local_period = (start, end, offset)
+        elif hasattr(timezone, 'localize'):
+            # pytz timezone with a fixed offset
+            self._local_period = (datetime.datetime.min, datetime.datetime.max, offset)
+
+        return utc
+
+    def convert(self, dt):
+        """Return a datetime converted to the timezone.
+
+        In:
+          - ``dt`` -- ``datetime`` object, naive datetimes being in the default timezone
+
+        Return:
+          - new localized ``datetime`` object
+        """
+        timezone = self.tzinfo
+        if not hasattr(timezone, 'localize'):
+            # Standard timezone, with conversions already fast
+            return (dt if dt.tzinfo else localize(dt, self.default_timezone)).astimezone(timezone)
+
+        utc = self.to_utc(dt)
+
+        start, end, offset, tzinfo = self._utc_period
+        if not (start <= utc < end):
+            period = self.get_period(timezone, utc)
+            if period is not None:
+                start, end, i = period
+                info = timezone._transition_info[i]
+                offset, tzinfo = info[0], timezone._tzinfos[info]
+            else:
+                # pytz timezone with a fixed offset
+                start, end = datetime.datetime.min, datetime.datetime.max
+                offset, tzinfo = timezone.utcoffset(utc), timezone
+
+            self._utc_period = (start, end, offset, tzinfo)
+
+        return (utc + offset).replace(tzinfo=tzinfo)
 
 
 class DummyTranslation:
@@ -299,6 +1209,7 @@ class Locale(CoreLocale):
         domain=None,
         timezone=None,
         default_timezone=None,
+        timezone_backend=None,
     ):
         """A locale.
 
@@ -319,27 +1230,41 @@ class Locale(CoreLocale):
           - ``default_timezone`` -- default timezone when a ``datetime`` object has
             no associated timezone. If no default timezone is given, the ``timezone``
             value is used
+          - ``timezone_backend`` -- ``pytz`` or ``zoneinfo``, to create the timezones from
+            their codes (default: the backend set by ``set_timezone_backend()``)
         """
         super().__init__(language, territory, script, variant)
 
         self.domain = domain
+        self._translations = {}  # Resolved translation objects, by domain: (catalog generation, translation object)
         self.translation_directories = {}
         if dirname is not None:
             self.add_translation_directory(dirname, domain)
 
+        self.timezone_backend = timezone_backend or _timezone_backend
+        self.utc = TIMEZONE_BACKENDS[self.timezone_backend][1]
+
         if isinstance(timezone, str):
-            timezone = pytz.timezone(timezone)
+            timezone = get_shared_timezone(timezone, self.timezone_backend)
         self.tzinfo = timezone
 
         if default_timezone is None:
             default_timezone = timezone
 
         if isinstance(default_timezone, str):
-            default_timezone = pytz.timezone(default_timezone)
+            default_timezone = get_shared_timezone(default_timezone, self.timezone_backend)
         self.default_timezone = default_timezone
 
-        self._previous_locales = []
-        self.zone_formats['region'] = '%s'
+        self._date_patterns = {}  # Compiled date/time patterns, by (format, kind)
+        self._zone_formats = None  # Created on first use, from the locale data
+
+    @property
+    def zone_formats(self):
+        """Patterns related to the formatting of time zones, the region format being the region only."""
+        if self._zone_formats is None:
+            self._zone_formats = localedata.LocaleDataDict(dict(super().zone_formats, region='%s'))
+
+        return self._zone_formats
 
     def add_translation_directory(self, dirname, domain=None):
         """Associate a directory to a translation domain.
@@ -349,6 +1274,7 @@ class Locale(CoreLocale):
           - ``domain`` -- the translation domain
         """
         self.translation_directories[domain] = dirname
+        self._translations.clear()
 
     def has_translation_directory(self, domain=None):
         """Test if a domain has an associated directory.
@@ -369,7 +1295,7 @@ class Locale(CoreLocale):
         """
         return self.translation_directories.get(domain)
 
-    def _get_translation(self, domain=None):
+    def _load_translation(self, domain):
         """Load the translation object, if not already loaded.
 
         In:
@@ -381,14 +1307,26 @@ class Locale(CoreLocale):
         if self.language is None:
             return DummyTranslation()
 
-        domain = domain or self.domain
         dirname = self.get_translation_directory(domain) or self.get_translation_directory(None)
-        args = (dirname, str(self), domain)
 
-        translation = _translations_cache.get(args)
-        if translation is None:
-            translation = support.Translations.load(*args)
-            _translations_cache[args] = translation
+        return load_translation(dirname, str(self), domain)
+
+    def _get_translation(self, domain=None):
+        """Return the translation object, kept by the locale until the loaded catalogs change.
+
+        In:
+          - ``domain`` -- translation domain
+
+        Return:
+          - translation object
+        """
+        domain = domain or self.domain
+
+        generation, translation = self._translations.get(domain, (None, None))
+        if generation != _catalog_generation:
+            generation = _catalog_generation
+            translation = self._load_translation(domain)
+            self._translations[domain] = (generation, translation)
 
         return translation
 
@@ -405,7 +1343,7 @@ class Locale(CoreLocale):
             catalog's charset encoding
         """
         msg = self._get_translation(domain).gettext(msg)
-        return msg % kw if kw else msg
+        return msg % kw if kw and ('%' in msg) else msg
 
     def ugettext(self, msg, domain=None, **kw):
         """Return the localized translation of a message.
@@ -419,7 +1357,7 @@ class Locale(CoreLocale):
           - the localized translation, as an unicode string
         """
         msg = self._get_translation(domain).ugettext(msg)
-        return msg % kw if kw else msg
+        return msg % kw if kw and ('%' in msg) else msg
 
     _ = ugettext
 
@@ -442,7 +1380,7 @@ class Locale(CoreLocale):
             catalog's charset encoding
         """
         msg = self._get_translation(domain).ngettext(singular, plural, n)
-        return msg % kw if kw else msg
+        return msg % kw if kw and ('%' in msg) else msg
 
     def ungettext(self, singular, plural, n, domain=None, **kw):
         """Return the plural-forms localized translation of a message.
@@ -463,10 +1401,78 @@ class Locale(CoreLocale):
           - the localized translation, as an unicode string
         """
         msg = self._get_translation(domain).ungettext(singular, plural, n)
-        return msg % kw if kw else msg
+        return msg % kw if kw and ('%' in msg) else msg
 
     _N = ungettext
 
+    def gettext_many(self, msgs, domain=None, **kw):
+        """Return the localized translations of messages.
+
+        The translation object is only retrieved once for all the messages.
+
+        In:
+          - ``msgs`` -- iterable of messages to translate
+          - ``domain`` -- translation domain
+          - ``kw`` -- optional values to substitute into all the translations
+
+        Return:
+          - list of the localized translations
+        """
+        gettext = self._get_translation(domain).gettext
+        return [msg % kw if kw and ('%' in msg) else msg for msg in map(gettext, msgs)]
+
+    def ugettext_many(self, msgs, domain=None, **kw):
+        """Return the localized translations of messages.
+
+        The translation object is only retrieved once for all the messages.
+
+        In:
+          - ``msgs`` -- iterable of messages to translate
+          - ``domain`` -- translation domain
+          - ``kw`` -- optional values to substitute into all the translations
+
+        Return:
+          - list of the localized translations, as unicode strings
+        """
+        ugettext = self._get_translation(domain).ugettext
+        return [msg % kw if kw and ('%' in msg) else msg for msg in map(ugettext, msgs)]
+
+    def ngettext_many(self, singular, plural, ns, domain=None, **kw):
+        """Return the plural-forms localized translations of a message for several counts.
+
+        The translation object is only retrieved once for all the counts.
+
+        In:
+          - ``singular`` -- singular form of the message
+          - ``plural`` -- plural form of the message
+          - ``ns`` -- iterable of counts
+          - ``domain`` -- translation domain
+          - ``kw`` -- optional values to substitute into all the translations
+
+        Return:
+          - list of the localized translations, one for each count
+        """
+        ngettext = self._get_translation(domain).ngettext
+        return [msg % kw if kw and ('%' in msg) else msg for msg in map(partial(ngettext, singular, plural), ns)]
+
+    def ungettext_many(self, singular, plural, ns, domain=None, **kw):
+        """Return the plural-forms localized translations of a message for several counts.
+
+        The translation object is only retrieved once for all the counts.
+
+        In:
+          - ``singular`` -- singular form of the message
+          - ``plural`` -- plural form of the message
+          - ``ns`` -- iterable of counts
+          - ``domain`` -- translation domain
+          - ``kw`` -- optional values to substitute into all the translations
+
+        Return:
+          - list of the localized translations, as unicode strings, one for each count
+        """
+        ungettext = self._get_translation(domain).ungettext
+        return [msg % kw if kw and ('%' in msg) else msg for msg in map(partial(ungettext, singular, plural), ns)]
+
     def lazy_gettext(self, msg, domain=None, **kw):
         """Return the lazy localized translation of a message.
 
@@ -547,16 +1553,35 @@ class Locale(CoreLocale):
           - new localized ``datetime`` object
         """
         if dt is None:
-            dt = datetime.datetime.now(tz=pytz.UTC)
+            dt = datetime.datetime.now(tz=self.utc)
 
         if not self.tzinfo:
             return dt
 
         if not dt.tzinfo:
-            dt = (self.default_timezone or pytz.UTC).localize(dt)
+            dt = localize(dt, self.default_timezone or self.utc)
 
         return dt.astimezone(self.tzinfo)
 
+    def to_timezone_many(self, dts):
+        """Return localized datetime objects.
+
+        The timezones are resolved only once and the UTC offsets cached by
+        transition period.
+
+        In:
+          - ``dts`` -- iterable of ``datetime`` objects
+
+        Return:
+          - generator of the new localized ``datetime`` objects
+        """
+        if not self.tzinfo:
+            return (datetime.datetime.now(tz=self.utc) if dt is None else dt for dt in dts)
+
+        convert = TimezoneConverter(self.tzinfo, self.default_timezone or self.utc).convert
+
+        return (convert(datetime.datetime.now(tz=self.utc) if dt is None else dt) for dt in dts)
+
     @property
     def now(self):
         return self.to_timezone()
@@ -571,16 +1596,49 @@ class Locale(CoreLocale):
           - new localized to UTC ``datetime`` object
         """
         if dt is None:
-            dt = datetime.datetime.now(tz=pytz.UTC)
+            dt = datetime.datetime.now(tz=self.utc)
 
         if not dt.tzinfo:
-            dt = (self.default_timezone or pytz.UTC).localize(dt)
+            dt = localize(dt, self.default_timezone or self.utc)
 
-        return dt.astimezone(pytz.UTC)
+        return dt.astimezone(self.utc)
 
     # Date & time formatting
     # ======================
 
+    def _get_date_pattern(self, format, kind):
+        """Return the compiled pattern of a date/time format.
+
+        The patterns are cached by locale. A named datetime format is compiled into
+        a single pattern, merging the date and time patterns into the locale glue pattern.
+
+        In:
+          - ``format`` -- 'full', 'long', 'medium', 'short' or a custom date/time pattern
+          - ``kind`` -- 'date', 'time' or 'datetime'
+
+        Return:
+          - the ``DateTimePattern`` object
+        """
+        key = (format, kind)
+        pattern = self._date_patterns.get(key)
+        if pattern is None:
+            if format not in ('full', 'long', 'medium', 'short'):
+                pattern = dates.parse_pattern(format)
+            elif kind == 'date':
+                pattern = self.date_formats[format]
+            elif kind == 'time':
+                pattern = self.time_formats[format]
+            else:
+                pattern = dates.parse_pattern(
+                    dates.get_datetime_format(format, self)
+                    .replace('{0}', self.time_formats[format].pattern)
+                    .replace('{1}', self.date_formats[format].pattern)
+                )
+
+            self._date_patterns[key] = pattern
+
+        return pattern
+
     def format_datetime(self, dt=None, format='medium'):
         """Return a date formatted according to the given pattern.
 
@@ -591,9 +1649,35 @@ class Locale(CoreLocale):
         Return:
           - The formatted datetime string
         """
+        pattern = self._get_date_pattern(format, 'datetime')
+
         if dt:
             dt = self.to_timezone(dt)
-        return dates.format_datetime(dt, format, locale=self, tzinfo=self.tzinfo)
+            if dt.tzinfo:
+                # Already in the locale timezone
+                return pattern.apply(dt, self)
+
+        return dates.format_datetime(dt, pattern, locale=self, tzinfo=self.tzinfo)
+
+    def format_datetime_many(self, dts, format='medium'):
+        """Return datetimes formatted according to the given pattern.
+
+        The pattern is compiled and the timezones resolved only once for all the datetimes.
+
+        In:
+          - ``dts`` -- iterable of ``datetime`` objects
+          - ``format`` -- 'full', 'long', 'medium', or 'short', or a custom date/time pattern
+
+        Return:
+          - generator of the formatted datetime strings
+        """
+        pattern = self._get_date_pattern(format, 'datetime')
+
+        for dt in self.to_timezone_many(dts):
+            if dt.tzinfo:
+                yield pattern.apply(dt, self)
+            else:
+                yield dates.format_datetime(dt, pattern, locale=self, tzinfo=self.tzinfo)
 
     def format_date(self, d=None, format='medium'):
         """Return a date formatted according to the given pattern.
@@ -605,7 +1689,7 @@ class Locale(CoreLocale):
         Return:
           - the formatted date string
         """
-        return dates.format_date(d, format, self)
+        return dates.format_date(d, self._get_date_pattern(format, 'date'), self)
 
     def format_time(self, t=None, format='medium'):
         """Return a time formatted according to the given pattern.
@@ -624,7 +1708,7 @@ class Locale(CoreLocale):
         if isinstance(t, datetime.datetime):
             t = self.to_utc(t)
 
-        return dates.format_time(t, format, locale=self, tzinfo=self.tzinfo)
+        return dates.format_time(t, self._get_date_pattern(format, 'time'), locale=self, tzinfo=self.tzinfo)
 
     def format_timedelta(self, delta, granularity='second', threshold=0.85, add_direction=False, format='long'):
         """Return a time delta.
@@ -918,6 +2002,104 @@ class Locale(CoreLocale):
         """Return value formatted in scientific notation."""
         return numbers.format_scientific(number, format, self, decimal_quantization)
 
+    @staticmethod
+    def _iter_numbers(values):
+        """Iterate over the numbers of an iterable or of a NumPy array."""
+        numpy = sys.modules.get('numpy')  # No array without NumPy already imported
+        if (numpy is not None) and isinstance(values, numpy.ndarray):
+            return (value.item() for value in values.flat)  # NumPy scalars to Python numbers, one at a time
+
+        return iter(values)
+
+    def _format_numbers(self, values, pattern, **kw):
+        pattern = numbers.parse_pattern(pattern)
+        apply = pattern.apply
+
+        return (apply(value, self, **kw) for value in self._iter_numbers(values))
+
+    def format_decimal_many(self, values, format=None, decimal_quantization=True):
+        """Format decimal numbers.
+
+        The pattern is only parsed once for all the numbers.
+
+        In:
+          - ``values`` -- iterable of numbers or NumPy array
+          - ``format`` -- the pattern (default: the locale decimal pattern)
+          - ``decimal_quantization`` -- truncate and round the fractional digits to the pattern
+
+        Return:
+          - generator of the formatted numbers
+        """
+        return self._format_numbers(
+            values, self.decimal_formats[None] if format is None else format, decimal_quantization=decimal_quantization
+        )
+
+    def format_currency_many(
+        self, values, currency, format=None, currency_digits=True, format_type='standard', decimal_quantization=True
+    ):
+        """Format currency values.
+
+        The pattern is only parsed once for all the values.
+
+        In:
+          - ``values`` -- iterable of numbers or NumPy array
+          - ``currency`` -- the currency code
+          - ``format`` -- the pattern (default: the locale currency pattern of ``format_type``)
+          - ``currency_digits`` -- use the currency natural number of decimal digits
+          - ``format_type`` -- 'standard', 'accounting' or 'name'
+          - ``decimal_quantization`` -- truncate and round the fractional digits to the pattern
+
+        Return:
+          - generator of the formatted values
+        """
+        if format_type == 'name':
+            return (
+                self.format_currency(value, currency, format, currency_digits, format_type, decimal_quantization)
+                for value in self._iter_numbers(values)
+            )
+
+        return self._format_numbers(
+            values,
+            format or self.currency_formats[format_type],
+            currency=currency,
+            currency_digits=currency_digits,
+            decimal_quantization=decimal_quantization,
+        )
+
+    def format_percent_many(self, values, format=None, decimal_quantization=True):
+        """Format percent values.
+
+        The pattern is only parsed once for all the values.
+
+        In:
+          - ``values`` -- iterable of numbers or NumPy array
+          - ``format`` -- the pattern (default: the locale percent pattern)
+          - ``decimal_quantization`` -- truncate and round the fractional digits to the pattern
+
+        Return:
+          - generator of the formatted values
+        """
+        return self._format_numbers(
+            values, format or self.percent_formats[None], decimal_quantization=decimal_quantization
+        )
+
+    def format_scientific_many(self, values, format=None, decimal_quantization=True):
+        """Format values in scientific notation.
+
+        The pattern is only parsed once for all the values.
+
+        In:
+          - ``values`` -- iterable of numbers or NumPy array
+          - ``format`` -- the pattern (default: the locale scientific pattern)
+          - ``decimal_quantization`` -- truncate and round the fractional digits to the pattern
+
+        Return:
+          - generator of the formatted values
+        """
+        return self._format_numbers(
+            values, format or self.scientific_formats[None], decimal_quantization=decimal_quantization
+        )
+
     # Number parsing
     # ==============
 
@@ -999,14 +2181,156 @@ class Locale(CoreLocale):
         previous_locale = get_locale()
 
         if not self.translation_directories:
-            self.translation_directories.update(previous_locale.translation_directories)
+            for domain, dirname in previous_locale.translation_directories.items():
+                self.add_translation_directory(dirname, domain)
 
-        self._previous_locales.append(previous_locale)
-        set_locale(self)
+        _locale_storage.push(self)
 
     def __exit__(self, *args, **kw):
         """Pop this locale from the stack."""
-        set_locale(self._previous_locales.pop())
+        _locale_storage.pop()
+
+
+_shared_locales = {}  # Interned locales
+_shared_locales_lock = threading.Lock()
+
+
+def get_shared_locale(
+    language='en',
+    territory=None,
+    script=None,
+    variant=None,
+    dirname=None,
+    domain=None,
+    timezone=None,
+    default_timezone=None,
+    timezone_backend=None,
+    factory=None,
+):
+    """Return the process-wide locale for these parameters, created on first use.
+
+    The returned locale is shared and must not be modified. Wrap it into a
+    ``LocaleView`` to associate per-request translation directories.
+
+    In:
+      - ``factory`` -- function creating the locale from the other parameters (default: ``Locale``)
+      - see ``Locale`` for the other parameters
+
+    Return:
+      - the shared locale
+    """
+    factory = factory or Locale
+    timezone_backend = timezone_backend or _timezone_backend
+    key = (language, territory, script, variant, dirname, domain, timezone, default_timezone, timezone_backend, factory)
+
+    locale = _shared_locales.get(key)
+    if locale is None:
+        with _shared_locales_lock:
+            locale = _shared_locales.get(key)
+            if locale is None:
+                locale = factory(
+                    language=language,
+                    territory=territory,
+                    script=script,
+                    variant=variant,
+                    dirname=dirname,
+                    domain=domain,
+                    timezone=timezone,
+                    default_timezone=default_timezone,
+                    timezone_backend=timezone_backend,
+                )
+                # Load the lazy locale data before sharing the locale
+                locale._data
+                locale.zone_formats
+
+                _shared_locales[key] = locale
+
+    return locale
+
+
+_locale_view_classes = {}  # View classes, by (view class, locale class)
+
+
+class LocaleView(Locale):
+    """Per-request locale sharing the state of an interned locale.
+
+    The attributes of the shared locale are copied, not its locale data,
+    timezones and caches which are shared. So the view is a real ``Locale``
+    whose attributes (i.e ``tzinfo``) can be changed for a request without
+    modifying the shared locale. The translation directories are copied
+    on their first access.
+
+    The view is also an instance of the shared locale class (i.e a
+    ``NegotiatedLocale`` subclass), with all its methods.
+    """
+
+    def __new__(cls, locale):
+        locale_class = type(locale)
+
+        view_class = _locale_view_classes.get((cls, locale_class))
+        if view_class is None:
+            if issubclass(cls, locale_class):
+                view_class = cls
+            else:
+                view_class = type(locale_class.__name__ + 'View', (cls, locale_class), {'__module__': cls.__module__})
+
+            _locale_view_classes[(cls, locale_class)] = view_class
+
+        return super().__new__(view_class)
+
+    def __init__(self, locale):
+        """Initialization.
+
+        In:
+          - ``locale`` -- the shared ``Locale``
+        """
+        self.__dict__.update(locale.__dict__)
+        del self.__dict__['translation_directories']
+
+        self.locale = locale
+        self._translation_directories = None  # Copied from the shared locale on the first access
+
+    def __repr__(self):
+        return '<LocaleView %r>' % self.locale
+
+    def __reduce__(self):
+        # The view classes created for the locale classes are not importable
+        return LocaleView, (self.locale,), self.__dict__
+
+    @property
+    def translation_directories(self):
+        if self._translation_directories is None:
+            self._translation_directories = dict(self.locale.translation_directories)
+            self._translations = {}  # The translations resolved with the shared directories are no longer valid
+
+        return self._translation_directories
+
+    def has_translation_directory(self, domain=None):
+        """Test if a domain has an associated directory.
+
+        In:
+          - ``domain`` -- the translation domain
+
+        Return:
+          - bool
+        """
+        translation_directories = self._translation_directories
+        if translation_directories is None:
+            translation_directories = self.locale.translation_directories
+
+        return domain in translation_directories
+
+    def get_translation_directory(self, domain=None):
+        """Return the directory associated to the domain.
+
+        In:
+          - ``domain`` -- the translation domain
+        """
+        translation_directories = self._translation_directories
+        if translation_directories is None:
+            translation_directories = self.locale.translation_directories
+
+        return translation_directories.get(domain)
 
 
 # -----------------------------------------------------------------------------
@@ -1022,6 +2346,8 @@ class NegotiatedLocale(Locale):
         domain=None,
         timezone=None,
         default_timezone=None,
+        timezone_backend=None,
+        negotiation_cache=None,
     ):
         """A locale with negotiated language and territory.
 
@@ -1040,15 +2366,97 @@ class NegotiatedLocale(Locale):
           - ``default_timezone`` -- default timezone when a ``datetime`` object has
             no associated timezone. If no default timezone is given, the ``timezone``
             value is used
+          - ``timezone_backend`` -- ``pytz`` or ``zoneinfo``, to create the timezones from their codes
+
+          - ``negotiation_cache`` -- optional ``LRUCache`` of the already negotiated
+            ``Accept-Language`` headers
+        """
+        language, territory = self.negotiate(request, locales, default_locale, negotiation_cache)
+
+        super().__init__(
+            language,
+            territory,
+            dirname=dirname,
+            domain=domain,
+            timezone=timezone,
+            default_timezone=default_timezone,
+            timezone_backend=timezone_backend,
+        )
+
+    @classmethod
+    def create(cls, language='en', territory=None, **config):
+        """Create a locale with an already negotiated language and territory.
+
+        In:
+          - ``language`` -- the negotiated language code
+          - ``territory`` -- the negotiated territory code
+          - ``config`` -- the other ``Locale`` parameters
+
+        Return:
+          - the locale
+        """
+        locale = cls.__new__(cls)
+        Locale.__init__(locale, language, territory, **config)
+
+        return locale
+
+    @classmethod
+    def negotiate(cls, request, locales, default_locale=(None, None), negotiation_cache=None, negotiation_table=None):
+        """Negotiate the language and territory from the ``Accept-Language`` header.
+
+        In:
+          - ``request`` -- the HTTP request object
+          - ``locales`` -- tuples of (language, territory) accepted by the application
+          - ``default_locale`` -- tuple of (language, territory) to use if the
+            negociation failed
+          - ``negotiation_cache`` -- optional ``LRUCache`` of the already negotiated
+            ``Accept-Language`` headers
+          - ``negotiation_table`` -- optional ``NegotiationTable`` precompiled from
+            ``locales`` and ``default_locale``. The negotiation cache is then dedicated
+            to this table and keyed by the headers alone
+
+        Return:
+          - the (language, territory) tuple
+        """
+        if negotiation_table is None:
+            negotiate = partial(cls.negotiate_accept_language, locales=locales, default_locale=default_locale)
+        else:
+            negotiate = negotiation_table.negotiate_accept_language
+
+        if negotiation_cache is None:
+            return negotiate(request.accept_language.parsed)
+
+        key = request.headers.get('Accept-Language')
+        if negotiation_table is None:
+            key = (key, tuple(map(tuple, locales)), tuple(default_locale))
+
+        negotiated = negotiation_cache.get(key)
+        if negotiated is None:
+            negotiated = negotiation_cache[key] = negotiate(request.accept_language.parsed)
+
+        return negotiated
+
+    @staticmethod
+    def negotiate_accept_language(accept_language, locales, default_locale=(None, None)):
+        """Negotiate the language and territory from the parsed ``Accept-Language`` header.
+
+        In:
+          - ``accept_language`` -- the (language, quality) tuples of the header
+          - ``locales`` -- tuples of (language, territory) accepted by the application
+          - ``default_locale`` -- tuple of (language, territory) to use if the
+            negociation failed
+
+        Return:
+          - the (language, territory) tuple
         """
         locale = negotiate_locale(
-            map(itemgetter(0), sorted(request.accept_language.parsed or (), key=itemgetter(1), reverse=True)),
+            map(itemgetter(0), sorted(accept_language or (), key=itemgetter(1), reverse=True)),
             ['-'.join(locale).rstrip('-') for locale in locales],
             '-',
         )
 
         if not locale:
-            language, territory = (default_locale + (None,))[:2]
+            language, territory = (tuple(default_locale) + (None,))[:2]
         else:
             locale = core.LOCALE_ALIASES.get(locale, locale).replace('_', '-')
 
@@ -1059,6 +2467,89 @@ class NegotiatedLocale(Locale):
                 language, territory = locale.split('-')
                 territory = territory.upper()
 
-        super().__init__(
-            language, territory, dirname=dirname, domain=domain, timezone=timezone, default_timezone=default_timezone
-        )
+        return language, territory
+
+
+class NegotiationTable:
+    """Precompiled negotiation of the language tags with a set of locales.
+
+    Gives the same results as ``NegotiatedLocale.negotiate_accept_language()``
+    but each tag is resolved by a lookup into a table built once for the
+    exact tags of the locales, their aliases and the language-only fallbacks
+    of the known locales. The other tags are resolved by a few set lookups.
+    """
+
+    def __init__(self, locales, default_locale=(None, None)):
+        """Initialization.
+
+        In:
+          - ``locales`` -- tuples of (language, territory) accepted by the application
+          - ``default_locale`` -- tuple of (language, territory) to use if the
+            negociation failed
+        """
+        available = ['-'.join(locale).rstrip('-') for locale in locales]
+
+        self.available = {locale.lower() for locale in available if locale}
+        self.default_locale = (tuple(default_locale) + (None,))[:2]
+
+        tags = set(core.LOCALE_ALIASES)
+        for locale in available + [identifier.replace('_', '-') for identifier in localedata.locale_identifiers()]:
+            language, _, territory = locale.partition('-')
+            if language.lower() in self.available:
+                tags.update((locale, locale.lower(), (language.lower() + '-' + territory.upper()).rstrip('-')))
+
+        self.table = {tag: self._negotiate_tag(tag) for tag in tags}
+
+    def _negotiate_tag(self, tag):
+        """Same steps than ``babel.negotiate_locale()`` for a single tag."""
+        tag_lower = tag.lower()
+
+        if tag_lower in self.available:
+            locale = tag
+        else:
+            alias = core.LOCALE_ALIASES.get(tag_lower)
+            alias = alias and alias.replace('_', '-')
+
+            if alias and (alias.lower() in self.available):
+                locale = alias
+            else:
+                language = tag.split('-')[0]
+                if (language == tag) or (language.lower() not in self.available):
+                    return None
+
+                locale = language
+
+        locale = core.LOCALE_ALIASES.get(locale, locale).replace('_', '-')
+        if '-' not in locale:
+            return locale, None
+
+        language, territory = locale.split('-')
+        return language, territory.upper()
+
+    def negotiate_tag(self, tag):
+        """Negotiate a language tag.
+
+        In:
+          - ``tag`` -- the language tag
+
+        Return:
+          - the (language, territory) tuple or ``None`` if no locale matches
+        """
+        negotiated = self.table.get(tag, _MISSING)
+        return self._negotiate_tag(tag) if negotiated is _MISSING else negotiated
+
+    def negotiate_accept_language(self, accept_language):
+        """Negotiate the language and territory from the parsed ``Accept-Language`` header.
+
+        In:
+          - ``accept_language`` -- the (language, quality) tuples of the header
+
+        Return:
+          - the (language, territory) tuple
+        """
+        for tag, _ in sorted(accept_language or (), key=itemgetter(1), reverse=True):
+            negotiated = self.negotiate_tag(tag)
+            if negotiated is not None:
+                return negotiated
+
+        return self.default_locale
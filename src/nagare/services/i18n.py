@@ -9,20 +9,118 @@
 
 """Internationalization service."""
 
+import gc
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from nagare import i18n
 from nagare.admin import i18n as i18n_commands
 from nagare.services import plugin
 
 
+def get_memory():
+    """Return the resident and shared memory sizes of the current process, in bytes (``None`` if unknown)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = f.read().split()
+        page_size = os.sysconf('SC_PAGE_SIZE')
+
+        return int(pages[1]) * page_size, int(pages[2]) * page_size
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None, None
+
+
+def get_rss():
+    """Return the resident memory size of the current process, in bytes (``None`` if unknown)."""
+    return get_memory()[0]
+
+
+def parse_catalog_path(path):
+    """Return the (locale, domain) of a catalog from its ``<locale>/LC_MESSAGES/<domain>.po`` path."""
+    messages_directory, filename = os.path.split(path)
+
+    return os.path.basename(os.path.dirname(messages_directory)), os.path.splitext(filename)[0]
+
+
 def on_change(event, path, o, method, services):
     return services(getattr(o, method), path) if event.event_type in ('created', 'modified', 'moved') else None
 
 
+_prefork_service = None  # Service warming up the started application process before its forks
+
+
+def before_fork():
+    if _prefork_service is not None:
+        _prefork_service.warmup()
+
+
+def after_fork_in_child():
+    global _prefork_service
+
+    if _prefork_service is not None:
+        service, _prefork_service = _prefork_service, None
+        service.report_worker_memory()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=before_fork, after_in_child=after_fork_in_child)
+
+
 class I18NService(plugin.Plugin):
     LOAD_PRIORITY = 70
-    CONFIG_SPEC = plugin.Plugin.CONFIG_SPEC | {'watch': 'boolean(default=True)'}
+    CONFIG_SPEC = plugin.Plugin.CONFIG_SPEC | {
+        'watch': 'boolean(default=True)',
+        'default_locale': 'string(default="en", help="locale used outside of a request")',
+        'default_timezone': 'string(default=None, help="timezone of the locale used outside of a request")',
+        'cache_size': 'integer(default=0, help="maximum number of loaded catalogs (0: no limit)")',
+        'backend': 'option("babel", "mmap", default="babel", help="load the whole catalogs or map them in memory")',
+        'preload': 'boolean(default=False, help="load all the catalogs at start")',
+        'preload_workers': 'integer(default=4, help="number of threads loading the catalogs")',
+        'prefork_warmup': 'boolean(default=False, help="load all the catalogs before the workers are forked")',
+        'gc_freeze': 'boolean(default=True, help="freeze the loaded objects for the garbage collector before forking")',
+        'locale_storage': 'option("local", "contextvars", default="local", help="where the current locale is kept")',
+    }
+
+    def __init__(
+        self,
+        name,
+        dist,
+        default_locale='en',
+        default_timezone=None,
+        cache_size=0,
+        backend='babel',
+        prefork_warmup=False,
+        gc_freeze=True,
+        locale_storage='local',
+        services_service=None,
+        **config,
+    ):
+        services_service(
+            super().__init__,
+            name,
+            dist,
+            default_locale=default_locale,
+            default_timezone=default_timezone,
+            cache_size=cache_size,
+            backend=backend,
+            prefork_warmup=prefork_warmup,
+            gc_freeze=gc_freeze,
+            locale_storage=locale_storage,
+            **config,
+        )
+        self.warmed_up = False
+
+        i18n.set_translations_backend(backend)
+        i18n.set_locale_storage(locale_storage)
+        i18n.set_translations_cache_size(cache_size)
+
+        language, territory = (default_locale + '_').split('_')[:2]
+        i18n.set_default_locale(
+            i18n.get_shared_locale(
+                language, territory or None, dirname=self.output_directory or None, timezone=default_timezone
+            )
+        )
 
     @classmethod
     def create_config_spec(cls, command_name, command):
@@ -33,6 +131,10 @@ class I18NService(plugin.Plugin):
             config_spec['relative_location'] = (
                 'boolean(default=False, help="if \\"add_location\\" is \\"full\\" or \\"file\\" generates file names relatives from the project root")'  # noqa: E501
             )
+            config_spec['jobs'] = 'integer(default=1, help="number of changed files extracted in parallel")'
+            config_spec['cache_directory'] = (
+                'string(default="", help="directory of the per file extraction results (default: in the user cache directory, \\"-\\" to disable)")'  # noqa: E501
+            )
 
         for name, _, description in command.user_options:
             name = name.strip('=')
@@ -65,6 +167,11 @@ class I18NService(plugin.Plugin):
         config_spec['__many__'] = config_spec.copy()
         cls.CONFIG_SPEC[command_name] = config_spec
 
+    @property
+    def cache_stats(self):
+        """Statistics of the loaded catalogs cache."""
+        return i18n.get_translations_cache_stats()
+
     @property
     def input_file(self):
         return self.plugin_config['extract']['output_file']
@@ -77,7 +184,89 @@ class I18NService(plugin.Plugin):
     def output_directory(self):
         return self.plugin_config['compile']['directory'] or self.input_directory
 
+    def find_catalogs(self):
+        """Return the (locale, domain) tuples of the compiled catalogs."""
+        directory = self.output_directory
+        if not directory or not os.path.isdir(directory):
+            return []
+
+        catalogs = []
+        for locale in sorted(os.listdir(directory)):
+            messages_directory = os.path.join(directory, locale, 'LC_MESSAGES')
+            if os.path.isdir(messages_directory):
+                for filename in sorted(os.listdir(messages_directory)):
+                    domain, ext = os.path.splitext(filename)
+                    if ext == '.mo':
+                        catalogs.append((locale, domain))
+
+        return catalogs
+
+    def preload(self, workers=None):
+        """Load all the compiled catalogs in parallel.
+
+        In:
+          - ``workers`` -- number of loading threads
+        """
+        directory = self.output_directory
+        catalogs = self.find_catalogs()
+
+        start = time.perf_counter()
+        rss = get_rss()
+
+        with ThreadPoolExecutor(workers or self.plugin_config['preload_workers']) as executor:
+            list(executor.map(lambda catalog: i18n.load_translation(directory, *catalog), catalogs))
+
+        duration = time.perf_counter() - start
+        if rss is None:
+            self.logger.info('%d catalogs preloaded in %.3fs', len(catalogs), duration)
+        else:
+            self.logger.info(
+                '%d catalogs preloaded in %.3fs, %.1f MiB used',
+                len(catalogs),
+                duration,
+                (get_rss() - rss) / 1024 / 1024,
+            )
+
+    def warmup(self):
+        """Load all the catalogs in the master process, before the workers are forked.
+
+        The catalogs are then shared, copy-on-write, by all the workers. Frozen, they are no longer
+        visited by the garbage collections which would write in their memory pages.
+        """
+        if not self.warmed_up:
+            self.warmed_up = True
+
+            self.preload()
+            self.logger.info('Master process: %s', self.format_memory())
+
+        if self.plugin_config['gc_freeze']:
+            # The garbage created since the previous fork is collected, not frozen forever
+            gc.collect()
+            gc.freeze()
+
+    def report_worker_memory(self):
+        self.logger.info('Worker process %d forked: %s', os.getpid(), self.format_memory())
+
+    @staticmethod
+    def format_memory():
+        rss, shared = get_memory()
+
+        return (
+            'memory unknown'
+            if rss is None
+            else '{:.1f} MiB resident, {:.1f} MiB shared'.format(rss / 1024 / 1024, shared / 1024 / 1024)
+        )
+
     def handle_start(self, app, services_service, reloader_service=None):
+        global _prefork_service
+
+        if self.plugin_config['preload']:
+            self.preload()
+
+        if self.plugin_config['prefork_warmup']:
+            # Only the forks of the started application, not the ones of the administrative commands
+            _prefork_service = self
+
         watch = self.plugin_config['watch']
 
         if watch and (reloader_service is not None) and self.input_directory and os.path.isdir(self.input_directory):
@@ -99,8 +288,11 @@ class I18NService(plugin.Plugin):
         return None
 
     def compile_on_change(self, path, services_service):
-        services_service(i18n_commands.Compile().run)
-        i18n.invalidate_caches()
+        locale, domain = parse_catalog_path(path)
+
+        services_service(i18n_commands.Compile().run, locale=locale, domain=domain)
+        i18n.reload_translations(self.output_directory, locale, domain)
+
         return False
 
 
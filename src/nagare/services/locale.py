@@ -9,13 +9,25 @@
 
 """Internationalization service."""
 
-from nagare.i18n import Locale, NegotiatedLocale, set_locale
+from nagare.i18n import (
+    Locale,
+    LRUCache,
+    LocaleView,
+    NegotiatedLocale,
+    NegotiationTable,
+    set_locale,
+    reset_locale,
+    get_shared_locale,
+)
 from nagare.services import plugin
 
 
 class I18NLocale(plugin.Plugin):
     LOAD_PRIORITY = 80
-    CONFIG_SPEC = plugin.Plugin.CONFIG_SPEC | {'dirname': 'string(default=None)'}
+    CONFIG_SPEC = plugin.Plugin.CONFIG_SPEC | {
+        'dirname': 'string(default=None)',
+        'timezone_backend': 'option("pytz", "zoneinfo", default="pytz", help="library creating the timezones")',
+    }
     LOCALE_FACTORY = Locale
 
     def __init__(self, name, dist, dirname=None, i18n_service=None, services_service=None, **config):
@@ -26,16 +38,20 @@ class I18NLocale(plugin.Plugin):
 
     @staticmethod
     def set_locale(locale):
-        set_locale(locale)
+        return set_locale(locale)
 
     def create_locale(self, **config):
         return self.LOCALE_FACTORY(**dict(self.config, **config))
 
     def handle_request(self, chain, **params):
         locale = self.get_locale(**params)
-        self.set_locale(locale)
+        token = self.set_locale(locale)
 
-        return chain.next(**params)
+        try:
+            return chain.next(**params)
+        finally:
+            # With the context variable storage, the locale must not stay in the context of the worker thread
+            reset_locale(token)
 
     def get_locale(self, **params):
         raise NotImplementedError()
@@ -61,8 +77,12 @@ class I18NPredefinedLocale(I18NLocale):
 
         self.locale = self.create_locale()
 
+    def create_locale(self, **config):
+        # Process-wide locale, created by the locale factory
+        return get_shared_locale(factory=self.LOCALE_FACTORY, **dict(self.config, **config))
+
     def get_locale(self, **params):
-        return self.locale
+        return LocaleView(self.locale)
 
 
 # -----------------------------------------------------------------------------
@@ -76,21 +96,28 @@ class I18NNegociatedLocale(I18NLocale):
         'domain': 'string(default=None)',
         'timezone': 'string(default=None)',
         'default_timezone': 'string(default=None)',
+        'negotiation_cache_size': 'integer(default=1024, help="number of ``Accept-Language`` headers negotiations kept (0: no limit)")',  # noqa: E501
     }
     LOCALE_FACTORY = NegotiatedLocale
 
-    def __init__(self, name, dist, locales=(), default_locale='', services_service=None, **config):
-        locales = [(locale + '_').split('_')[:2] for locale in locales]
-        default_locale = (default_locale + '_').split('_')[:2]
-
-        services_service(
-            super().__init__,
-            name,
-            dist,
-            locales=locales,
-            default_locale=tuple(default_locale),
-            **config,
+    def __init__(
+        self, name, dist, locales=(), default_locale='', negotiation_cache_size=1024, services_service=None, **config
+    ):
+        self.locales = [tuple((locale + '_').split('_')[:2]) for locale in locales]
+        self.default_locale = tuple((default_locale + '_').split('_')[:2])
+        self.negotiation_cache = LRUCache(negotiation_cache_size)
+        self.negotiation_table = NegotiationTable(self.locales, self.default_locale)
+
+        services_service(super().__init__, name, dist, **config)
+
+    def create_locale(self, request, **config):
+        language, territory = self.LOCALE_FACTORY.negotiate(
+            request, self.locales, self.default_locale, self.negotiation_cache, self.negotiation_table
+        )
+
+        return LocaleView(
+            get_shared_locale(language, territory, factory=self.LOCALE_FACTORY.create, **dict(self.config, **config))
         )
 
     def get_locale(self, request, **params):
-        return super().create_locale(request=request)
+        return self.create_locale(request)
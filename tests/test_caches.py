@@ -0,0 +1,258 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+import os
+import time
+import threading
+
+import pytest
+
+from nagare import i18n, local
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
+
+def setup_module(module):
+    local.request = local.Process()
+
+
+def test_lru_eviction():
+    cache = i18n.LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+
+    cache['c'] = 3
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.stats['evictions'] == 1
+
+    cache.resize(1)
+    assert len(cache) == 1
+    assert 'c' in cache
+
+
+def test_lru_eviction_order():
+    cache = i18n.LRUCache(100)
+    for i in range(1000):
+        cache[i] = i
+        cache.get(i - 50)  # Keeps the entries 50 insertions before alive
+        cache[i % 10] = i  # Replaces existing entries
+
+    assert len(cache) == 100
+    assert len(cache._order) == len(cache)  # One heap item by entry
+    assert set(range(10)) <= set(cache)
+    assert 940 in cache
+    assert 500 not in cache
+
+
+def test_single_flight_loading():
+    cache = i18n.LRUCache()
+    loadings = []
+
+    def loader(key):
+        loadings.append(key)
+        time.sleep(0.05)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('a', loader, 'a'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['A'] * 8
+    assert loadings == ['a']
+    assert cache.stats['loads'] == 1
+    assert cache.stats['load_time'] > 0
+
+
+def test_translations_cache():
+    i18n.invalidate_caches()
+    i18n.set_locale(i18n.Locale('fr', 'FR', dirname=LOCALE_DIR))
+
+    loads = i18n.get_translations_cache_stats()['loads']
+    assert i18n.gettext('hello') == 'bonjour'
+    assert i18n.gettext('hello') == 'bonjour'
+    assert i18n.get_translations_cache_stats()['loads'] == loads + 1
+
+    i18n.set_translations_cache_size(1)
+    i18n.set_locale(i18n.Locale('de', 'DE', dirname=LOCALE_DIR))
+    assert i18n.gettext('hello') == 'hello'
+    assert i18n.get_translations_cache_stats()['size'] == 1
+
+    i18n.set_translations_cache_size(None)
+
+
+def test_load_translation():
+    i18n.invalidate_caches()
+
+    translation = i18n.load_translation(LOCALE_DIR, 'fr', 'messages')
+    assert translation.gettext('hello') == 'bonjour'
+    assert i18n.Locale('fr', dirname=LOCALE_DIR)._get_translation() is translation
+    assert i18n.Locale('fr', dirname=LOCALE_DIR, domain='messages')._get_translation() is translation
+
+
+def test_reload_translations():
+    i18n.invalidate_caches()
+
+    fr = i18n.load_translation(LOCALE_DIR, 'fr')
+    fr_fr = i18n.load_translation(LOCALE_DIR, 'fr_FR')
+    de = i18n.load_translation(LOCALE_DIR, 'de')
+    other_domain = i18n.load_translation(LOCALE_DIR, 'fr', 'other')
+
+    i18n.reload_translations(LOCALE_DIR, 'fr', 'messages')
+
+    assert i18n.load_translation(LOCALE_DIR, 'fr') is not fr
+    assert i18n.load_translation(LOCALE_DIR, 'fr_FR') is not fr_fr
+    assert i18n.load_translation(LOCALE_DIR, 'fr_FR').gettext('hello') == 'bonjour'
+    assert i18n.load_translation(LOCALE_DIR, 'de') is de
+    assert i18n.load_translation(LOCALE_DIR, 'fr', 'other') is other_domain
+
+
+def test_locale_translations_memo():
+    i18n.invalidate_caches()
+    locale = i18n.Locale('fr', 'FR', dirname=LOCALE_DIR)
+
+    translation = locale._get_translation()
+    hits = i18n.get_translations_cache_stats()['hits']
+    assert locale._get_translation() is translation
+    assert i18n.get_translations_cache_stats()['hits'] == hits
+    assert locale._get_translation('messages') is translation
+
+    i18n.reload_translations(LOCALE_DIR, 'fr')
+    assert locale._get_translation() is not translation
+    assert locale.gettext('hello') == 'bonjour'
+
+    translation = locale._get_translation()
+    i18n.invalidate_caches()
+    assert locale._get_translation() is not translation
+
+    locale.add_translation_directory('/unknown')
+    assert locale.gettext('hello') == 'hello'
+
+
+def test_lru_concurrent_accesses():
+    cache = i18n.LRUCache(16)
+    errors = []
+
+    def worker(n):
+        for i in range(2000):
+            key = (n * 7 + i) % 32
+            cache[key] = key * 2
+            value = cache.get(key // 2)
+            if value is not None and value != key // 2 * 2:
+                errors.append(value)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(cache) == 16
+    assert all(cache.get(key) == key * 2 for key in cache)
+
+
+def test_lru_counters_by_thread():
+    cache = i18n.LRUCache(16)
+    cache['a'] = 1
+
+    def worker():
+        for _ in range(1000):
+            cache.get('a')
+            cache.get('b')
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (cache.stats['hits'], cache.stats['misses']) == (8000, 8000)  # No lost count
+    assert len(cache._counters) <= 8
+
+
+def test_lru_recent_entries_not_updated():
+    cache = i18n.LRUCache(4)
+    cache['a'] = 1
+    cache['b'] = 2
+    last_use = cache._entries['a'][1]
+
+    assert cache.get('a') == 1
+    assert cache._entries['a'][1] == last_use  # Inserted less than 2 insertions ago
+
+    cache['c'] = 3
+    assert cache.get('a') == 1
+    assert cache._entries['a'][1] == cache._clock
+
+
+def test_single_flight_loading_after_publication():
+    loader_thread = threading.Thread(target=lambda: cache.get_or_load('a', loader, 'a'))
+
+    class SlowReleaseLock:
+        """Lock pausing the loading thread after each release."""
+
+        def __init__(self):
+            self.lock = threading.Lock()
+
+        def __enter__(self):
+            self.lock.acquire()
+
+        def __exit__(self, *args):
+            self.lock.release()
+            if threading.current_thread() is loader_thread:
+                time.sleep(0.1)
+
+    cache = i18n.LRUCache()
+    cache._lock = SlowReleaseLock()
+    loadings = []
+
+    def loader(key):
+        loadings.append(key)
+        return key.upper()
+
+    loader_thread.start()
+    time.sleep(0.15)  # The loading thread is pausing after its last lock release
+    assert cache.get_or_load('a', loader, 'a') == 'A'
+    loader_thread.join()
+
+    assert loadings == ['a']
+
+
+def test_failed_loading():
+    cache = i18n.LRUCache()
+
+    def loader(key):
+        raise OSError(key)
+
+    with pytest.raises(OSError):
+        cache.get_or_load('a', loader, 'a')
+
+    assert 'a' not in cache
+    assert cache.get_or_load('a', str.upper, 'a') == 'A'
+
+
+def test_translations_shared_by_file():
+    i18n.invalidate_caches()
+    loads = i18n.get_translations_cache_stats()['loads']
+
+    translation = i18n.load_translation(LOCALE_DIR, 'fr')
+    locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+    assert locale.gettext('hello') == 'bonjour'
+    assert locale._get_translation() is translation
+    assert i18n.get_translations_cache_stats()['loads'] == loads + 1
+
+    i18n.reload_translations(LOCALE_DIR, 'fr')
+    assert locale._get_translation() is not translation
+    assert locale._get_translation() is i18n.load_translation(LOCALE_DIR, 'fr')
+    assert i18n.get_translations_cache_stats()['loads'] == loads + 1
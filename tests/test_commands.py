@@ -0,0 +1,308 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+import io
+import os
+import inspect
+import logging
+
+import pytest
+from babel import support
+from babel.messages.pofile import read_po, write_po
+from babel.messages.catalog import Catalog
+
+from nagare import i18n
+from nagare.admin import i18n as i18n_commands
+
+
+class I18NService:
+    logger = logging.getLogger('nagare.services.i18n')
+
+
+def services(f, *args, **kw):
+    """Call ``f`` with the services it needs."""
+    parameters = inspect.signature(f).parameters
+    for name, service in (('i18n_service', I18NService()), ('services_service', services)):
+        if name in parameters:
+            kw.setdefault(name, service)
+
+    return f(*args, **kw)
+
+
+def create_command(cls):
+    """Create a command object, without configuring the command plugin."""
+    return cls.__new__(cls), cls.create_command()[1]
+
+
+def write_catalog(directory, locale, messages, mtime=None):
+    po_file = os.path.join(directory, locale, 'LC_MESSAGES', 'messages.po')
+    os.makedirs(os.path.dirname(po_file), exist_ok=True)
+
+    catalog = Catalog(locale=locale, fuzzy=False)
+    for msgid, msgstr in messages.items():
+        catalog.add(msgid, msgstr)
+
+    with open(po_file, 'wb') as f:
+        write_po(f, catalog)
+
+    if mtime is not None:
+        os.utime(po_file, (mtime, mtime))
+
+    return po_file
+
+
+def compile_catalogs(directory, **config):
+    compile_command, command = create_command(i18n_commands.Compile)
+
+    return services(
+        compile_command.run_command,
+        command,
+        input_file='',
+        directory=directory,
+        locale=None,
+        domain=None,
+        output_file=None,
+        **config,
+    )
+
+
+def test_compile_modified_catalogs(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    directory = str(tmp_path)
+
+    fr_po = write_catalog(directory, 'fr', {'hello': 'bonjour'}, mtime=1000)
+    write_catalog(directory, 'de', {'hello': 'hallo'}, mtime=1000)
+
+    assert compile_catalogs(directory) == 0
+    assert '2 catalogs compiled' in caplog.text
+
+    fr_mo = fr_po[:-3] + '.mo'
+    mtime = os.stat(fr_mo).st_mtime_ns
+
+    caplog.clear()
+    assert compile_catalogs(directory) == 0
+    assert 'catalogs are up to date' in caplog.text
+    assert os.stat(fr_mo).st_mtime_ns == mtime
+
+    caplog.clear()
+    os.utime(fr_po, (os.path.getmtime(fr_mo) + 10,) * 2)
+    assert compile_catalogs(directory) == 0
+    assert '1 catalogs compiled' in caplog.text
+    assert 'fr/LC_MESSAGES/messages.po' in caplog.text
+    assert 'de/LC_MESSAGES/messages.po' not in caplog.text
+
+    caplog.clear()
+    assert compile_catalogs(directory, force=True) == 0
+    assert '2 catalogs compiled' in caplog.text
+
+
+def test_compile_in_parallel(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    directory = str(tmp_path)
+
+    for locale, hello in (('fr', 'bonjour'), ('de', 'hallo'), ('it', 'ciao')):
+        write_catalog(directory, locale, {'hello': hello})
+
+    assert compile_catalogs(directory, jobs=2) == 0
+    assert '3 catalogs compiled' in caplog.text
+
+    # The log calls of the worker processes are replayed
+    for locale in ('fr', 'de', 'it'):
+        po_file = os.path.join(directory, locale, 'LC_MESSAGES', 'messages.po')
+        assert 'compiling catalog ' + po_file in caplog.text
+
+    translations = support.Translations.load(directory, ['de'])
+    assert translations.gettext('hello') == 'hallo'
+
+
+def extract(input_dir, output_file, **config):
+    extract_command, command = create_command(i18n_commands.Extract)
+    config = dict({'project': 'test', 'version': '1.0', 'relative_location': False}, **config)
+
+    return services(
+        extract_command.run_command,
+        command,
+        _root=input_dir,
+        input_dirs=[input_dir],
+        output_file=output_file,
+        keywords=None,
+        **config,
+    )
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+def write_source(directory, filename, *messages):
+    with open(os.path.join(directory, filename), 'w') as f:
+        f.writelines('_({!r})\n'.format(message) for message in messages)
+
+
+def read_template(output_file):
+    with open(output_file, 'rb') as f:
+        return read_po(f)
+
+
+def test_extraction_cache(tmp_path, cache_home, caplog):
+    caplog.set_level(logging.INFO)
+
+    input_dir = str(tmp_path / 'src')
+    output_file = str(tmp_path / 'locale' / 'messages.pot')
+    cache_directory = i18n_commands.Extract.get_cache_directory(output_file)
+    assert cache_directory.startswith(str(cache_home))
+
+    os.makedirs(input_dir)
+    write_source(input_dir, 'a.py', 'hello')
+    write_source(input_dir, 'b.py', 'world')
+
+    extract(input_dir, output_file)
+    assert '2 files extracted, 0 from the cache' in caplog.text
+    assert {message.id for message in read_template(output_file) if message.id} == {'hello', 'world'}
+    assert len(os.listdir(cache_directory)) == 2
+
+    caplog.clear()
+    write_source(input_dir, 'b.py', 'world', 'again')
+    extract(input_dir, output_file)
+    assert '2 files extracted, 1 from the cache' in caplog.text
+    assert 'extracting messages from ' + os.path.join(input_dir, 'b.py') in caplog.text
+    assert 'extracting messages from ' + os.path.join(input_dir, 'a.py') not in caplog.text
+    assert {message.id for message in read_template(output_file) if message.id} == {'hello', 'world', 'again'}
+    assert len(os.listdir(cache_directory)) == 2  # Result of the previous b.py pruned
+
+    caplog.clear()
+    os.remove(os.path.join(input_dir, 'a.py'))
+    extract(input_dir, output_file)
+    assert '1 files extracted, 1 from the cache' in caplog.text
+    assert {message.id for message in read_template(output_file) if message.id} == {'world', 'again'}
+    assert len(os.listdir(cache_directory)) == 1
+
+    caplog.clear()
+    extract(input_dir, output_file, add_comments=['NOTE'])
+    assert '1 files extracted, 0 from the cache' in caplog.text  # The extraction options changed
+
+
+def test_extraction_without_cache(tmp_path, cache_home):
+    input_dir = str(tmp_path / 'src')
+    output_file = str(tmp_path / 'locale' / 'messages.pot')
+
+    os.makedirs(input_dir)
+    write_source(input_dir, 'a.py', 'hello')
+
+    extract(input_dir, output_file, cache_directory='-')
+    assert os.listdir(tmp_path / 'locale') == ['messages.pot']
+    assert not cache_home.exists()
+
+    cache_directory = str(tmp_path / 'extraction')
+    extract(input_dir, output_file, cache_directory=cache_directory)
+    assert len(os.listdir(cache_directory)) == 1
+    assert not cache_home.exists()
+
+
+def test_parallel_extraction(tmp_path):
+    input_dir = str(tmp_path / 'src')
+    os.makedirs(input_dir)
+    for i in range(4):
+        write_source(input_dir, 'm{}.py'.format(i), 'message {}'.format(i), 'common')
+
+    extract(input_dir, str(tmp_path / 'messages1.pot'), cache_directory='-')
+    extract(input_dir, str(tmp_path / 'messages2.pot'), cache_directory='-', jobs=2)
+
+    messages1 = [(message.id, message.locations) for message in read_template(str(tmp_path / 'messages1.pot'))]
+    messages2 = [(message.id, message.locations) for message in read_template(str(tmp_path / 'messages2.pot'))]
+    assert messages1 == messages2
+    assert len(messages1) == 6
+
+
+def test_relative_locations():
+    f = io.BytesIO()
+    relative_locations = i18n_commands.RelativeLocations(f, '/project/root')
+
+    data = b'#: /project/root/a.py:1\nmsgid "a"\n#: /other/b.py:2\n#: /project/root/c/d.py:3\nmsgid "b"'
+    for i in range(0, len(data), 5):  # Lines and prefixes split between the writes
+        relative_locations.write(data[i : i + 5])
+    relative_locations.flush()
+
+    assert f.getvalue() == b'#: a.py:1\nmsgid "a"\n#: /other/b.py:2\n#: c/d.py:3\nmsgid "b"'
+
+
+def test_template_writing(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+
+    input_dir = str(tmp_path / 'src')
+    output_file = str(tmp_path / 'locale' / 'messages.pot')
+
+    os.makedirs(input_dir)
+    write_source(input_dir, 'a.py', 'hello')
+
+    extract(input_dir, output_file, relative_location=True)
+    assert [message.locations for message in read_template(output_file) if message.id] == [[('a.py', 1)]]
+    mtime = os.stat(output_file).st_mtime_ns
+
+    caplog.clear()
+    extract(input_dir, output_file, relative_location=True)
+    assert 'PO template file {} unchanged'.format(output_file) in caplog.text
+    assert os.stat(output_file).st_mtime_ns == mtime
+    assert os.listdir(tmp_path / 'locale') == ['messages.pot']  # No temporary file left
+
+    extract(input_dir, output_file)
+    assert [message.locations for message in read_template(output_file) if message.id] == [
+        [(os.path.join(input_dir, 'a.py'), 1)]
+    ]
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_compile_mapped_catalog(tmp_path, jobs):
+    directory = str(tmp_path)
+    messages = {'message {}'.format(i): 'translation {}'.format(i) for i in range(5000)}
+
+    write_catalog(directory, 'fr', dict(messages, hello='bonjour'), mtime=1000)
+    write_catalog(directory, 'de', {'hello': 'hallo'}, mtime=1000)
+    compile_catalogs(directory, jobs=jobs)
+
+    translations = i18n.MappedTranslations.load(directory, 'fr')
+    assert translations.gettext('message 4999') == 'translation 4999'
+
+    # A smaller catalog compiled over the mapped file doesn't invalidate the mapping
+    write_catalog(directory, 'fr', {'hello': 'salut'})
+    compile_catalogs(directory, jobs=jobs, force=True)
+
+    assert translations.gettext('message 4999') == 'translation 4999'
+    assert translations.gettext('hello') == 'bonjour'
+    assert i18n.MappedTranslations.load(directory, 'fr').gettext('hello') == 'salut'
+    assert sorted(os.listdir(os.path.join(directory, 'fr', 'LC_MESSAGES'))) == ['messages.mo', 'messages.po']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_compiled_hash_table(tmp_path, jobs):
+    directory = str(tmp_path)
+
+    po_file = write_catalog(directory, 'fr', {'message {}'.format(i): 'traduction {}'.format(i) for i in range(100)})
+    with open(po_file, 'rb') as f:
+        catalog = read_po(f)
+    catalog.add('open', 'ouvrir', context='menu')
+    catalog.add(('apple', 'apples'), ('pomme', 'pommes'))
+    with open(po_file, 'wb') as f:
+        write_po(f, catalog)
+
+    compile_catalogs(directory, jobs=jobs)
+
+    translations = i18n.MappedTranslations.load(directory, 'fr')
+    assert translations._hash_size == 137  # Next prime after 4/3 of the 103 messages, with the metadata
+    assert translations.gettext('message 42') == 'traduction 42'
+    assert translations.pgettext('menu', 'open') == 'ouvrir'
+    assert translations.gettext('open') == 'open'
+    assert translations.ngettext('apple', 'apples', 2) == 'pommes'
+    assert translations._key_order is None  # No index built
+
+    babel_translations = support.Translations.load(directory, ['fr'])
+    assert babel_translations.gettext('message 42') == 'traduction 42'
+    assert babel_translations.pgettext('menu', 'open') == 'ouvrir'
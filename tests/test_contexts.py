@@ -7,8 +7,17 @@
 # this distribution.
 # --
 
+import os
+import asyncio
+import contextvars
+import concurrent.futures
+
+import pytest
+
 from nagare import i18n, local
 
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
 
 def setup_module(module):
     local.request = local.Process()
@@ -27,3 +36,110 @@ def test_context_manager():
             assert i18n.get_locale().domain == 'domain2'
 
     assert i18n.get_locale().domain == 'domain1'
+
+
+@pytest.fixture(params=sorted(i18n.LOCALE_STORAGES))
+def locale_storage(request):
+    i18n.set_locale_storage(request.param)
+    yield request.param
+    i18n.set_locale_storage('local')
+
+
+def test_nested_context_managers(locale_storage):
+    locale1 = i18n.Locale('fr', 'FR')
+    locale2 = i18n.Locale('de', 'DE')
+
+    i18n.set_locale(locale1)
+    with locale2:
+        assert i18n.get_locale() is locale2
+        with locale1:
+            assert i18n.get_locale() is locale1
+            with locale2:
+                assert i18n.get_locale() is locale2
+            assert i18n.get_locale() is locale1
+        assert i18n.get_locale() is locale2
+
+    assert i18n.get_locale() is locale1
+
+
+def test_context_manager_exception(locale_storage):
+    locale1 = i18n.Locale('fr', 'FR')
+    locale2 = i18n.Locale('de', 'DE')
+
+    i18n.set_locale(locale1)
+    with pytest.raises(ValueError), locale2:
+        raise ValueError()
+
+    assert i18n.get_locale() is locale1
+
+
+def test_contextvars_tasks():
+    i18n.set_locale_storage('contextvars')
+    shared_locale = i18n.get_shared_locale('de', 'DE')
+
+    async def task(language, territory):
+        i18n.set_locale(i18n.Locale(language, territory))
+        await asyncio.sleep(0)
+
+        with shared_locale:
+            await asyncio.sleep(0.01)
+            assert i18n.get_locale() is shared_locale
+
+        await asyncio.sleep(0)
+        locale = i18n.get_locale()
+
+        return locale.language, locale.territory
+
+    async def main():
+        return await asyncio.gather(*[task(*locale) for locale in [('fr', 'FR'), ('en', 'US'), ('it', 'IT')]])
+
+    try:
+        assert asyncio.run(main()) == [('fr', 'FR'), ('en', 'US'), ('it', 'IT')]
+    finally:
+        i18n.set_locale_storage('local')
+
+
+def test_contextvars_thread_pool():
+    i18n.set_locale_storage('contextvars')
+
+    def job():
+        return str(i18n.get_locale())
+
+    try:
+        with i18n.Locale('fr', 'FR'), concurrent.futures.ThreadPoolExecutor(1) as executor:
+            context = contextvars.copy_context()
+            assert executor.submit(context.run, job).result() == 'fr_FR'
+    finally:
+        i18n.set_locale_storage('local')
+
+
+def test_context_manager_translation_directories():
+    i18n.set_locale(i18n.Locale('fr', 'FR', dirname=LOCALE_DIR))
+
+    locale = i18n.Locale('fr', 'FR')
+    assert locale.gettext('hello') == 'hello'  # Translation resolved without directory
+
+    with locale:
+        assert i18n.gettext('hello') == 'bonjour'
+
+
+def test_reset_locale(locale_storage):
+    locale1 = i18n.Locale('fr', 'FR')
+    locale2 = i18n.Locale('de', 'DE')
+
+    def handle_request():
+        token = i18n.set_locale(locale2)
+        assert i18n.get_locale() is locale2
+        i18n.reset_locale(token)
+
+    i18n.set_locale(locale1)
+    handle_request()
+    assert i18n.get_locale() is locale1
+
+    def worker():
+        # Fresh context of a thread
+        handle_request()
+        return i18n.get_locale()
+
+    local.request = local.Process()
+    assert contextvars.Context().run(worker) is i18n.get_default_locale()
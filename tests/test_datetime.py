@@ -11,6 +11,7 @@ import datetime
 
 import pytz
 import pytest
+from babel import dates
 
 from nagare import i18n, local
 from nagare.i18n import Locale, set_locale
@@ -33,6 +34,26 @@ def test_format_datetime():
     assert i18n.format_datetime(dt, "yyyy.MM.dd G 'at' HH:mm:ss zzz") == '2007.04.01 AD at 11:30:00 EDT'
 
 
+@pytest.mark.parametrize('locale', ['en_US', 'fr_FR', 'de_DE', 'ja_JP', 'ar_EG', 'ru_RU'])
+def test_format_datetime_compiled_patterns(locale):
+    tz = pytz.timezone('Europe/Paris')
+    locale = Locale.parse(locale)
+    locale.tzinfo = tz
+    dt = tz.localize(datetime.datetime(2024, 7, 14, 9, 5, 3))
+
+    for format in ('full', 'long', 'medium', 'short'):
+        assert locale.format_datetime(dt, format) == dates.format_datetime(dt, format, locale=locale, tzinfo=tz)
+        assert locale.format_date(dt, format) == dates.format_date(dt, format, locale=locale)
+        assert locale.format_time(dt, format) == dates.format_time(dt, format, locale=locale, tzinfo=tz)
+
+    format = 'EEEE d MMMM y HH:mm zzzz'
+    assert locale.format_datetime(dt, format) == dates.format_datetime(dt, format, locale=locale, tzinfo=tz)
+    assert locale.format_date(dt, 'EEEE d MMMM y') == dates.format_date(dt, 'EEEE d MMMM y', locale=locale)
+    assert locale.format_time(dt, 'HH:mm zzzz') == dates.format_time(dt, 'HH:mm zzzz', locale=locale, tzinfo=tz)
+
+    assert locale._get_date_pattern('full', 'datetime') is locale._get_date_pattern('full', 'datetime')
+
+
 def test_format_date():
     d = datetime.date(2007, 4, 1)
 
@@ -0,0 +1,143 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+import os
+import struct
+
+from babel import support
+
+from nagare import i18n, local
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
+MESSAGES = {
+    '': 'Content-Type: text/plain; charset=UTF-8\nPlural-Forms: nplurals=2; plural=(n > 1);\n',
+    'hello': 'bonjour',
+    'world': 'monde',
+    'été': 'summer',
+    'apple\0apples': 'pomme\0pommes',
+    'menu\x04open': 'ouvrir',
+}
+
+
+def setup_module(module):
+    local.request = local.Process()
+
+
+def teardown_module(module):
+    i18n.set_translations_backend('babel')
+
+
+def write_mo(filename, messages, hash_size, reverse=False):
+    """Write a ``MO`` file with a GNU hash table, as ``msgfmt`` does."""
+    keys = sorted((k.encode('utf-8') for k in messages), reverse=reverse)
+    values = [messages[k.decode('utf-8')].encode('utf-8') for k in keys]
+
+    n = len(keys)
+    originals = 28
+    translations = originals + n * 8
+    hash_table = translations + n * 8
+    offset = hash_table + hash_size * 4
+
+    strings = b''
+    originals_table = translations_table = b''
+    for key in keys:
+        originals_table += struct.pack('<2I', len(key), offset + len(strings))
+        strings += key + b'\0'
+    for value in values:
+        translations_table += struct.pack('<2I', len(value), offset + len(strings))
+        strings += value + b'\0'
+
+    table = [0] * hash_size
+    for i, key in enumerate(keys if hash_size else ()):
+        h = i18n.hash_string(key.partition(b'\0')[0])
+        index = h % hash_size
+        while table[index]:
+            index = (index + 1 + h % (hash_size - 2)) % hash_size
+        table[index] = i + 1
+
+    with open(filename, 'wb') as f:
+        f.write(struct.pack('<7I', 0x950412DE, 0, n, originals, translations, hash_size, hash_table))
+        f.write(originals_table + translations_table + struct.pack('<%dI' % hash_size, *table) + strings)
+
+
+def check_translations(translations):
+    assert translations.gettext('hello') == 'bonjour'
+    assert translations.gettext('été') == 'summer'
+    assert translations.gettext('unknown') == 'unknown'
+    assert translations.ngettext('apple', 'apples', 1) == 'pomme'
+    assert translations.ngettext('apple', 'apples', 2) == 'pommes'
+    assert translations.ngettext('pear', 'pears', 2) == 'pears'
+    assert translations.gettext('apple') == 'pomme'
+    assert translations.pgettext('menu', 'open') == 'ouvrir'
+    assert translations.pgettext('file', 'open') == 'open'
+    assert translations.npgettext('menu', 'open', 'opens', 2) == 'opens'
+
+
+def test_hash_table(tmp_path):
+    dirname = tmp_path / 'fr' / 'LC_MESSAGES'
+    dirname.mkdir(parents=True)
+    write_mo(str(dirname / 'messages.mo'), MESSAGES, 11)
+
+    translations = i18n.MappedTranslations.load(str(tmp_path), 'fr_FR')
+    assert translations._hash_size == 11
+    check_translations(translations)
+
+
+def test_hash_string(tmp_path):
+    # Values of the GNU gettext 32 bits hash function
+    assert i18n.hash_string(b'hello') == 7258927
+    assert i18n.hash_string(b'hyhxxrzdn') == 174  # Intermediate value overflowing 32 bits
+
+    dirname = tmp_path / 'fr' / 'LC_MESSAGES'
+    dirname.mkdir(parents=True)
+    write_mo(str(dirname / 'messages.mo'), dict(MESSAGES, hyhxxrzdn='found'), 11)
+
+    assert i18n.MappedTranslations.load(str(tmp_path), 'fr').gettext('hyhxxrzdn') == 'found'
+
+
+def test_binary_search(tmp_path):
+    dirname = tmp_path / 'fr' / 'LC_MESSAGES'
+    dirname.mkdir(parents=True)
+    write_mo(str(dirname / 'messages.mo'), MESSAGES, 0)
+
+    translations = i18n.MappedTranslations.load(str(tmp_path), 'fr')
+    assert translations._hash_size == 0
+    assert translations._key_order is None
+    check_translations(translations)
+    assert translations._key_order == range(len(MESSAGES))
+
+
+def test_unsorted_messages(tmp_path):
+    dirname = tmp_path / 'fr' / 'LC_MESSAGES'
+    dirname.mkdir(parents=True)
+    write_mo(str(dirname / 'messages.mo'), MESSAGES, 0, reverse=True)
+
+    translations = i18n.MappedTranslations.load(str(tmp_path), 'fr')
+    check_translations(translations)
+    assert list(translations._key_order) == list(reversed(range(len(MESSAGES))))
+
+
+def test_babel_compiled_catalog():
+    translations = i18n.MappedTranslations.load(LOCALE_DIR, 'fr_FR', 'messages')
+    babel_translations = support.Translations.load(LOCALE_DIR, 'fr_FR', 'messages')
+
+    assert translations.gettext('hello') == babel_translations.gettext('hello') == 'bonjour'
+    assert isinstance(i18n.MappedTranslations.load(LOCALE_DIR, 'de'), support.NullTranslations)
+
+
+def test_backend():
+    i18n.set_translations_backend('mmap')
+    i18n.set_locale(i18n.Locale('fr', 'FR', dirname=LOCALE_DIR))
+
+    assert isinstance(i18n.get_locale()._get_translation(), i18n.MappedTranslations)
+    assert i18n.gettext('hello') == 'bonjour'
+
+    i18n.set_translations_backend('babel')
+    assert isinstance(i18n.get_locale()._get_translation(), support.Translations)
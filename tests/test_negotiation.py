@@ -0,0 +1,133 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+import itertools
+
+import pytest
+
+from nagare import i18n
+
+LOCALES = [('fr', 'FR'), ('de', 'DE'), ('en', '')]
+
+
+class AcceptLanguage:
+    def __init__(self, header):
+        self.parsed = []
+        for i, language in enumerate(header.split(',') if header else ()):
+            language, _, quality = language.strip().partition(';q=')
+            self.parsed.append((language, float(quality or 1) - i / 1000))
+
+
+class Request:
+    def __init__(self, header):
+        self.headers = {'Accept-Language': header} if header is not None else {}
+        self.accept_language = AcceptLanguage(header)
+
+
+def test_negotiation():
+    locale = i18n.NegotiatedLocale(Request('de-DE,de;q=0.9'), LOCALES)
+    assert (locale.language, locale.territory) == ('de', 'DE')
+
+    locale = i18n.NegotiatedLocale(Request('it,fr;q=0.5'), LOCALES)
+    assert (locale.language, locale.territory) == ('fr', 'FR')
+
+    locale = i18n.NegotiatedLocale(Request('en-US'), LOCALES)
+    assert (locale.language, locale.territory) == ('en', 'US')
+
+    locale = i18n.NegotiatedLocale(Request('it'), LOCALES, ('de', 'DE'))
+    assert (locale.language, locale.territory) == ('de', 'DE')
+
+    locale = i18n.NegotiatedLocale(Request(None), LOCALES, ('de', 'DE'))
+    assert (locale.language, locale.territory) == ('de', 'DE')
+
+
+def test_negotiation_cache():
+    cache = i18n.LRUCache(2)
+
+    locale = i18n.NegotiatedLocale(Request('de-DE,de;q=0.9'), LOCALES, negotiation_cache=cache)
+    assert (locale.language, locale.territory) == ('de', 'DE')
+    assert cache.stats == {
+        'size': 1,
+        'max_size': 2,
+        'hits': 0,
+        'misses': 1,
+        'evictions': 0,
+        'loads': 0,
+        'load_time': 0.0,
+    }
+
+    locale = i18n.NegotiatedLocale(Request('de-DE,de;q=0.9'), LOCALES, negotiation_cache=cache)
+    assert (locale.language, locale.territory) == ('de', 'DE')
+    assert cache.stats == {
+        'size': 1,
+        'max_size': 2,
+        'hits': 1,
+        'misses': 1,
+        'evictions': 0,
+        'loads': 0,
+        'load_time': 0.0,
+    }
+
+    i18n.NegotiatedLocale(Request('fr'), LOCALES, negotiation_cache=cache)
+    i18n.NegotiatedLocale(Request('en'), LOCALES, negotiation_cache=cache)
+    assert cache.stats == {
+        'size': 2,
+        'max_size': 2,
+        'hits': 1,
+        'misses': 3,
+        'evictions': 1,
+        'loads': 0,
+        'load_time': 0.0,
+    }
+
+    locale = i18n.NegotiatedLocale(Request('fr'), LOCALES, ('de', 'DE'), negotiation_cache=cache)
+    assert (locale.language, locale.territory) == ('fr', 'FR')
+    assert cache.stats['misses'] == 4
+
+
+TAGS = ['de-DE', 'de', 'fr', 'fr-CA', 'en', 'en-US', 'en-gb', 'it', 'no', 'nb-NO', 'pt-BR', 'pt', 'zh-Hant-TW', '*', '']
+
+
+@pytest.mark.parametrize(
+    'locales',
+    [
+        LOCALES,
+        [('fr', 'FR'), ('de', '')],
+        [('nb', 'NO'), ('pt', 'BR'), ('en', 'GB')],
+        [('zh', 'TW'), ('EN', 'us')],
+        [],
+    ],
+)
+def test_negotiation_table(locales):
+    table = i18n.NegotiationTable(locales, ('de', 'DE'))
+
+    headers = [','.join(tags) for tags in itertools.permutations(TAGS, 2)]
+    headers += [tag.upper() for tag in TAGS] + [tag.lower() for tag in TAGS] + [tag.swapcase() for tag in TAGS]
+    headers += ['fr;q=0.5,de;q=0.8', 'it,en-US;q=0.1,fr;q=0.1', None]
+
+    for header in headers:
+        accept_language = Request(header).accept_language.parsed
+
+        assert table.negotiate_accept_language(accept_language) == i18n.NegotiatedLocale.negotiate_accept_language(
+            accept_language, locales, ('de', 'DE')
+        ), header
+
+
+def test_negotiation_with_table():
+    table = i18n.NegotiationTable(LOCALES)
+
+    locale = i18n.NegotiatedLocale.negotiate(Request('it,fr;q=0.5'), LOCALES, negotiation_table=table)
+    assert locale == ('fr', 'FR')
+
+    cache = i18n.LRUCache()
+    locale = i18n.NegotiatedLocale.negotiate(
+        Request('en-US'), LOCALES, negotiation_cache=cache, negotiation_table=table
+    )
+    assert locale == ('en', 'US')
+    assert list(cache) == ['en-US']  # Cache dedicated to the table, keyed by the headers alone
@@ -7,7 +7,9 @@
 # this distribution.
 # --
 
+import sys
 import datetime
+import subprocess
 from decimal import Decimal
 
 import pytest
@@ -66,6 +68,40 @@ def test_format_currency():
     assert i18n.format_currency(1099.9876, 'USD', decimal_quantization=False) == '$1,099.9876'
 
 
+def test_format_many():
+    values = [0, 1.2346, -1099.98, 25.1234, Decimal('12345.678')]
+
+    for locale in (Locale('en', 'US'), Locale('de', 'DE'), Locale('sv', 'SE')):
+        set_locale(locale)
+
+        assert list(i18n.format_decimal_many(values)) == [i18n.format_decimal(v) for v in values]
+        assert list(i18n.format_decimal_many(iter(values), '#,##0.0', False)) == [
+            i18n.format_decimal(v, '#,##0.0', False) for v in values
+        ]
+        assert list(i18n.format_currency_many(values, 'EUR')) == [i18n.format_currency(v, 'EUR') for v in values]
+        assert list(i18n.format_currency_many(values, 'EUR', format_type='name')) == [
+            i18n.format_currency(v, 'EUR', format_type='name') for v in values
+        ]
+        assert list(i18n.format_percent_many(values)) == [i18n.format_percent(v) for v in values]
+        assert list(i18n.format_scientific_many(values)) == [i18n.format_scientific(v) for v in values]
+
+
+def test_format_many_numpy():
+    numpy = pytest.importorskip('numpy')
+
+    set_locale(Locale('en', 'US'))
+    assert list(i18n.format_decimal_many(numpy.array([[1099, 1.5], [-2, 0]]))) == ['1,099', '1.5', '-2', '0']
+
+    formatted = i18n.format_decimal_many(numpy.arange(10**6))
+    assert next(formatted) == '0'
+    assert next(formatted) == '1'
+
+
+def test_numpy_not_imported():
+    code = 'import sys, nagare.i18n; print("numpy" in sys.modules)'
+    assert subprocess.check_output([sys.executable, '-c', code], text=True).strip() == 'False'  # noqa: S603
+
+
 def test_get_exponential_symbol():
     set_locale(Locale('en', 'US'))
     assert i18n.get_exponential_symbol() == 'E'
@@ -0,0 +1,128 @@
+# --
+# Copyright (c) 2014-2025 Net-ng.
+# All rights reserved.
+#
+# This software is licensed under the BSD License, as described in
+# the file LICENSE.txt, which you should have received as part of
+# this distribution.
+# --
+
+import os
+import pickle
+import datetime
+
+import pytz
+from babel import dates
+
+from nagare import i18n, local
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
+
+def setup_module(module):
+    local.request = local.Process()
+
+
+def test_shared_locale():
+    locale1 = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR, timezone='Europe/Paris')
+    locale2 = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR, timezone='Europe/Paris')
+    assert locale1 is locale2
+
+    locale3 = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+    assert locale3 is not locale1
+    assert locale3 == locale1
+
+
+def test_locale_view():
+    locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+    view = i18n.LocaleView(locale)
+
+    assert view == locale
+    assert str(view) == 'fr_FR'
+    assert (view.language, view.territory) == ('fr', 'FR')
+    assert view.get_translation_directory() == LOCALE_DIR
+    assert view.gettext('hello') == 'bonjour'
+    assert view.lazy_gettext('hello') == 'bonjour'
+    assert view.format_decimal(1.5) == '1,5'
+
+
+def test_locale_view_translation_directories():
+    locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+    view = i18n.LocaleView(locale)
+
+    view.add_translation_directory('/unknown')
+    assert view.get_translation_directory() == '/unknown'
+    assert view.gettext('hello') == 'hello'
+
+    assert locale.get_translation_directory() == LOCALE_DIR
+    assert locale.gettext('hello') == 'bonjour'
+
+
+def test_locale_view_context_manager():
+    locale = i18n.get_shared_locale('fr', 'FR', domain='domain1')
+    view1 = i18n.LocaleView(i18n.get_shared_locale('fr', 'FR', domain='domain2'))
+    view2 = i18n.LocaleView(i18n.get_shared_locale('fr', 'FR', domain='domain2'))
+
+    i18n.set_locale(locale)
+    with view1:
+        assert i18n.get_locale() is view1
+        with view2:
+            assert i18n.get_locale() is view2
+        assert i18n.get_locale() is view1
+
+    assert i18n.get_locale() is locale
+    assert not local.request.nagare_previous_locales
+
+
+def test_shared_locale_data_loaded():
+    locale = i18n.get_shared_locale('de', 'AT', dirname=LOCALE_DIR)
+    assert locale._Locale__data is not None
+    assert locale._zone_formats is not None
+
+
+def test_locale_view_is_a_locale():
+    locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR, timezone='Europe/Paris')
+    view = i18n.LocaleView(locale)
+
+    assert isinstance(view, i18n.Locale)
+    assert dates.format_date(datetime.date(2007, 4, 1), locale=view) == '1 avr. 2007'
+
+    view.tzinfo = pytz.timezone('America/New_York')
+    assert str(view.tzinfo) == 'America/New_York'
+    assert str(locale.tzinfo) == 'Europe/Paris'
+    assert view.format_time(datetime.datetime(2007, 4, 1, 15, 30, tzinfo=pytz.UTC)) == '11:30:00'
+
+
+class GreetingLocale(i18n.Locale):
+    def greet(self):
+        return self.gettext('hello')
+
+
+def test_locale_view_of_a_locale_subclass():
+    locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR, factory=GreetingLocale)
+    assert locale is i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR, factory=GreetingLocale)
+    assert locale is not i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+
+    view = i18n.LocaleView(locale)
+    assert isinstance(view, (i18n.LocaleView, GreetingLocale))
+    assert view.greet() == 'bonjour'
+    assert type(view) is type(i18n.LocaleView(locale))
+
+
+def test_locale_view_serialization():
+    view = i18n.LocaleView(i18n.get_shared_locale('fr', 'CA', factory=GreetingLocale))
+    view.domain = 'other'
+
+    view = pickle.loads(pickle.dumps(view))  # noqa: S301
+    assert isinstance(view, (i18n.LocaleView, GreetingLocale))
+    assert (str(view), view.domain, view.locale.domain) == ('fr_CA', 'other', None)
+
+
+def test_locale_view_of_a_negotiated_locale():
+    locale = i18n.get_shared_locale('de', 'DE', dirname=LOCALE_DIR, factory=i18n.NegotiatedLocale.create)
+    assert type(locale) is i18n.NegotiatedLocale
+    assert (locale.language, locale.territory) == ('de', 'DE')
+
+    view = i18n.LocaleView(locale)
+    assert isinstance(view, i18n.NegotiatedLocale)
+    assert repr(view) == '<LocaleView %r>' % locale
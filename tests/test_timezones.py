@@ -10,6 +10,8 @@
 import datetime
 
 import pytz
+import pytest
+from babel import Locale
 
 from nagare import i18n, local
 
@@ -18,6 +20,13 @@ def setup_module(module):
     local.request = local.Process()
 
 
+@pytest.fixture(autouse=True, params=sorted(i18n.TIMEZONE_BACKENDS))
+def timezone_backend(request):
+    i18n.set_timezone_backend(request.param)
+    yield request.param
+    i18n.set_timezone_backend('pytz')
+
+
 def test_to_timezone_no_timezone_datetime():
     d1 = datetime.datetime(2007, 4, 1, 15, 30)
 
@@ -331,3 +340,46 @@ def test_format_datetime_with_format():
     tz = pytz.timezone('Africa/Niamey')
     d = tz.localize(datetime.datetime(2007, 4, 1, 15, 30))
     assert i18n.format_datetime(d, format="yyyy.MM.dd G 'at' HH:mm:ss zzz") == '2007.04.01 AD at 06:30:00 -0800'
+
+
+def test_to_timezone_many():
+    dts = [datetime.datetime(2021, 3, 28, 1, 0) + datetime.timedelta(minutes=m) for m in range(0, 24 * 60, 17)]
+    dts += [datetime.datetime(2021, 10, 31, 1, 0) + datetime.timedelta(minutes=m) for m in range(0, 4 * 60, 7)]
+    dts += [pytz.timezone('Asia/Tokyo').localize(dt) for dt in dts[:20]] + [datetime.datetime(2007, 4, 1, 15, 30)]
+
+    for timezone, default_timezone in (
+        (None, None),
+        ('Europe/Paris', None),
+        ('Europe/Paris', 'Europe/Paris'),
+        ('America/New_York', 'Europe/Paris'),
+        ('UTC', 'Australia/Lord_Howe'),
+        ('Pacific/Pitcairn', pytz.UTC),
+    ):
+        i18n.set_locale(i18n.Locale('fr', 'FR', timezone=timezone, default_timezone=default_timezone))
+
+        for dt1, dt2 in zip(i18n.to_timezone_many(dts), map(i18n.to_timezone, dts)):
+            assert (dt1, dt1.tzinfo) == (dt2, dt2.tzinfo)
+
+
+def test_format_datetime_many():
+    dts = [datetime.datetime(2007, 4, 1, 15, 30), datetime.datetime(2007, 12, 1, 15, 30, tzinfo=pytz.UTC)]
+
+    i18n.set_locale(i18n.Locale('fr', 'FR', timezone='Europe/Paris', default_timezone=pytz.UTC))
+    assert list(i18n.format_datetime_many(dts, 'full')) == [i18n.format_datetime(dt, 'full') for dt in dts]
+
+    i18n.set_locale(i18n.Locale('en', 'US'))
+    assert list(i18n.format_datetime_many(iter(dts))) == [i18n.format_datetime(dt) for dt in dts]
+
+
+def test_shared_timezones(timezone_backend):
+    timezone = i18n.get_shared_timezone('Europe/Paris')
+    assert i18n.get_shared_timezone('Europe/Paris', timezone_backend) is timezone
+
+    locale1 = i18n.Locale('fr', 'FR', timezone='Europe/Paris')
+    locale2 = i18n.Locale('fr', 'FR', timezone='Europe/Paris', default_timezone='Europe/Paris')
+    assert locale1.tzinfo is locale2.tzinfo is locale2.default_timezone is timezone
+
+
+def test_region_format():
+    assert i18n.Locale('fr', 'FR').zone_formats['region'] == '%s'
+    assert Locale('fr', 'FR').zone_formats['region'] != '%s'
@@ -8,13 +8,20 @@
 # --
 
 import os
+import copy
+import pickle
+
+from babel.messages.mofile import write_mo
+from babel.messages.catalog import Catalog
 
 from nagare import i18n, local
 
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
 
 def setup_module(module):
     local.request = local.Process()
-    locale = i18n.Locale('fr', 'FR', dirname=os.path.join(os.path.dirname(__file__), 'locale'))
+    locale = i18n.Locale('fr', 'FR', dirname=LOCALE_DIR)
     i18n.set_locale(locale)
 
 
@@ -30,6 +37,12 @@ def test_gettext_params():
     assert s == 'Vacances 2010'
 
 
+def test_gettext_params_without_substitution():
+    assert i18n.gettext('hello', year=2010) == 'bonjour'
+    assert i18n.gettext('100%%', year=2010) == '100%'
+    assert i18n.gettext('100%') == '100%'
+
+
 def test_gettext_unknown():
     s = i18n.gettext('unknown')
     assert isinstance(s, str)
@@ -120,6 +133,17 @@ def test_N_plural():
     assert s == 'chevaux'
 
 
+def test_gettext_many():
+    assert i18n.gettext_many(['hello', 'unknown']) == ['bonjour', 'unknown']
+    assert i18n.ugettext_many(iter(['hello', 'Holidays']), year=2010) == ['bonjour', 'Vacances 2010']
+    assert i18n.ugettext_many([]) == []
+
+
+def test_ngettext_many():
+    assert i18n.ngettext_many('horse', 'horses', [1, 3]) == ['cheval', 'chevaux']
+    assert i18n.ungettext_many('unknown1', 'unknown2', range(3)) == ['unknown2', 'unknown1', 'unknown2']
+
+
 def test_lazy_gettext():
     s = i18n.lazy_gettext('hello')
     assert s.__class__.__name__ == 'LazyProxy'
@@ -195,3 +219,73 @@ def test_LN_ungettext_plural():
     assert s.__class__.__name__ == 'LazyProxy'
     assert isinstance(s.value, str)
     assert s == 'chevaux'
+
+
+def test_lazy_proxy_locale_change():
+    evaluations = []
+
+    def ugettext(msg):
+        evaluations.append(msg)
+        return i18n.ugettext(msg)
+
+    s = i18n.LazyProxy(ugettext, 'hello')
+    locale = i18n.get_locale()
+    try:
+        assert str(s) == 'bonjour'
+        assert str(s) == 'bonjour'
+        assert len(evaluations) == 1
+
+        i18n.set_locale(i18n.Locale('de', 'DE', dirname=LOCALE_DIR))
+        assert str(s) == 'hello'
+
+        shared_locale = i18n.get_shared_locale('fr', 'FR', dirname=LOCALE_DIR)
+        i18n.set_locale(i18n.LocaleView(shared_locale))
+        assert str(s) == 'bonjour'
+        i18n.set_locale(i18n.LocaleView(shared_locale))
+        assert str(s) == 'bonjour'
+        assert len(evaluations) == 3
+
+        i18n.invalidate_caches()
+        assert str(s) == 'bonjour'
+        assert len(evaluations) == 4
+    finally:
+        i18n.set_locale(locale)
+
+
+def test_lazy_proxy_locale_view_domain(tmp_path):
+    for domain, hello in (('messages', 'bonjour'), ('other', 'salut')):
+        catalog = Catalog(locale='fr', domain=domain, fuzzy=False)
+        catalog.add('hello', hello)
+
+        os.makedirs(tmp_path / 'fr' / 'LC_MESSAGES', exist_ok=True)
+        with open(tmp_path / 'fr' / 'LC_MESSAGES' / (domain + '.mo'), 'wb') as f:
+            write_mo(f, catalog)
+
+    s = i18n.lazy_gettext('hello')
+    shared_locale = i18n.get_shared_locale('fr', dirname=str(tmp_path))
+    locale = i18n.get_locale()
+    try:
+        i18n.set_locale(i18n.LocaleView(shared_locale))
+        assert str(s) == 'bonjour'
+
+        view = i18n.LocaleView(shared_locale)
+        view.domain = 'other'
+        i18n.set_locale(view)
+        assert i18n.gettext('hello') == 'salut'
+        assert str(s) == 'salut'
+
+        i18n.set_locale(i18n.LocaleView(shared_locale))
+        assert str(s) == 'bonjour'
+    finally:
+        i18n.set_locale(locale)
+
+
+def test_lazy_proxy_copy_and_pickle():
+    s = i18n.lazy_ugettext('Holidays', year=2010)
+    assert str(s) == 'Vacances 2010'
+
+    for s2 in (copy.copy(s), copy.deepcopy(s), pickle.loads(pickle.dumps(s))):  # noqa: S301
+        assert isinstance(s2, i18n.LazyProxy)
+        assert s2 == 'Vacances 2010'
+
+    assert not hasattr(s, '__dict__')